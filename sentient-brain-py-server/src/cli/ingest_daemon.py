@@ -0,0 +1,142 @@
+"""
+Long-lived ingest daemon that processes files sent by the `process_file` CLI.
+
+The CLI is run once per changed file from a git hook; doing the work in-process
+means every file pays for importing the SDKs, building the embedder and
+connecting to Neo4j/Weaviate. The daemon keeps one `CodeGraphService` (and its
+connections) alive and accepts newline-delimited JSON requests on a UNIX socket:
+
+    {"file": "/app/src/x.py", "commit_hash": "...", "commit_author": "..."}
+
+(or `"files": [...]` to ingest several files as one batch) and answers each with `{"ok": true}` or `{"ok": false, "error": "..."}`.
+
+The API server starts it in its lifespan (sharing the server's service);
+it can also be run standalone with `python -m src.cli.ingest_daemon`.
+"""
+
+import os
+import sys
+import json
+import socket
+import threading
+import socketserver
+from pathlib import Path
+
+DEFAULT_SOCKET_PATH = str(Path.home() / ".sentient-brain" / "ingest.sock")
+# Files processed at once; further requests wait for a free slot
+MAX_INGEST_WORKERS = int(os.getenv("INGEST_MAX_WORKERS", "4"))
+
+
+def get_socket_path() -> str:
+    return os.getenv("INGEST_SOCKET", DEFAULT_SOCKET_PATH)
+
+
+def send_request(request: dict, socket_path: str | None = None, timeout: float = 600) -> dict | None:
+    """Send one request to a running daemon; returns None if none is listening."""
+    socket_path = socket_path or get_socket_path()
+    if not os.path.exists(socket_path):
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(socket_path)
+            sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as reader:
+                line = reader.readline()
+    except (ConnectionRefusedError, FileNotFoundError):
+        # Stale socket file from a daemon that is no longer running
+        return None
+    return json.loads(line) if line else {"ok": False, "error": "daemon closed the connection"}
+
+
+class _IngestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+                with self.server.slots:
+                    self.server.ingest.process(request)
+                response = {"ok": True}
+            except Exception as e:
+                response = {"ok": False, "error": str(e)}
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+class _IngestServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class IngestDaemon:
+    """Serves ingest requests against a shared `CodeGraphService`."""
+
+    def __init__(self, code_graph_service, socket_path: str | None = None, max_workers: int = MAX_INGEST_WORKERS):
+        self.code_graph_service = code_graph_service
+        self.socket_path = socket_path or get_socket_path()
+        self.max_workers = max_workers
+        self._server: _IngestServer | None = None
+        self._thread: threading.Thread | None = None
+
+    def process(self, request: dict):
+        # Imported here; process_file imports this module for `send_request`
+        from .process_file import read_source
+
+        file_paths = request.get("files") or [request["file"]]
+        for file_path in file_paths:
+            if not os.path.exists(file_path):
+                raise FileNotFoundError(f"File not found at {file_path}")
+        files = []
+        for file_path in file_paths:
+            source_code = read_source(file_path)
+            if source_code is not None:  # oversized or binary; skipped like the in-process path
+                files.append((file_path, source_code))
+        if not files:
+            return
+        self.code_graph_service.process_files(
+            files,
+            commit_hash=request.get("commit_hash"),
+            commit_author=request.get("commit_author"),
+        )
+        print(f"[INGEST_DAEMON] Processed {', '.join(path for path, _ in files)}", flush=True)
+
+    def start(self):
+        """Bind the socket and serve requests on a background thread."""
+        Path(self.socket_path).parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        self._server = _IngestServer(self.socket_path, _IngestHandler)
+        self._server.ingest = self
+        self._server.slots = threading.BoundedSemaphore(self.max_workers)
+        self._thread = threading.Thread(target=self._server.serve_forever, name="ingest-daemon", daemon=True)
+        self._thread.start()
+        print(f"[INGEST_DAEMON] Listening on {self.socket_path}", flush=True)
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        print("[INGEST_DAEMON] Stopped.", flush=True)
+
+
+def main():
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+    sys.path.insert(0, project_root)
+    from src.services.code_graph_service import CodeGraphService
+
+    daemon = IngestDaemon(CodeGraphService())
+    daemon.start()
+    try:
+        daemon._thread.join()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.stop()
+
+
+if __name__ == "__main__":
+    main()
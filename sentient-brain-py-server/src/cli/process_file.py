@@ -1,9 +1,17 @@
 """
-CLI entrypoint to process a single file and add it to the knowledge graph.
+CLI entrypoint to process source files and add them to the knowledge graph.
+
+`--file` may be repeated; all files of one invocation (e.g. every file of a
+commit) are ingested as one batch.
+
+If an ingest daemon is listening (see `ingest_daemon.py`), the file is handed
+to it so the SDK imports and DB connections are not paid again per file;
+otherwise the file is processed in-process.
 """
 
 import os
 import sys
+import mmap
 import argparse
 
 # Add the project root to Python path to resolve relative imports
@@ -11,40 +19,86 @@ project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..
 sys.path.insert(0, project_root)
 
 try:
-    from src.services.code_graph_service import CodeGraphService
+    from src.cli.ingest_daemon import send_request
 except ImportError:
     # Fallback for when running as module
-    from services.code_graph_service import CodeGraphService
+    from cli.ingest_daemon import send_request
+
+# Generated/vendored files past this size are not worth parsing
+MAX_FILE_BYTES = int(os.getenv("PROCESS_FILE_MAX_BYTES", str(5 * 1024 * 1024)))
+BINARY_SNIFF_BYTES = 8192
+
+def read_source(file_path: str) -> bytes | None:
+    """Return the raw file contents, or None for oversized or binary files.
+
+    The file is memory-mapped so the size and binary checks happen before
+    anything is copied or decoded.
+    """
+    size = os.path.getsize(file_path)
+    if size > MAX_FILE_BYTES:
+        print(f"Skipping {file_path}: {size} bytes exceeds limit of {MAX_FILE_BYTES}")
+        return None
+    if size == 0:
+        return b""
+    with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if b"\x00" in mm[:BINARY_SNIFF_BYTES]:
+            print(f"Skipping {file_path}: binary content")
+            return None
+        return mm[:]
 
 def main():
-    parser = argparse.ArgumentParser(description="Process a source code file for the knowledge graph.")
-    parser.add_argument("--file", required=True, help="The absolute path to the file to process.")
+    parser = argparse.ArgumentParser(description="Process source code files for the knowledge graph.")
+    parser.add_argument("--file", required=True, action="append", dest="files",
+                        help="The absolute path to a file to process (repeatable).")
     parser.add_argument("--commit-hash", help="The Git commit hash.")
     parser.add_argument("--commit-author", help="The Git commit author.")
     args = parser.parse_args()
 
-    file_path = args.file
-    if not os.path.exists(file_path):
-        print(f"Error: File not found at {file_path}")
+    missing = [file_path for file_path in args.files if not os.path.exists(file_path)]
+    if missing:
+        print(f"Error: File not found at {', '.join(missing)}")
         sys.exit(1)
+    label = ", ".join(args.files)
+
+    response = send_request({
+        "files": [os.path.abspath(file_path) for file_path in args.files],
+        "commit_hash": args.commit_hash,
+        "commit_author": args.commit_author,
+    })
+    if response is not None:
+        if not response.get("ok"):
+            print(f"✗ Error processing {label}: {response.get('error')}")
+            sys.exit(1)
+        print(f"✓ Successfully processed {label} (ingest daemon)")
+        if args.commit_hash:
+            print(f"✓ Linked to commit {args.commit_hash}")
+        return
 
-    with open(file_path, 'r', encoding='utf-8') as f:
-        source_code = f.read()
+    files = []
+    for file_path in args.files:
+        source_code = read_source(file_path)
+        if source_code is not None:
+            files.append((file_path, source_code))
+    if not files:
+        sys.exit(0)
 
     try:
-        # Initialize the service and process the file
+        # No daemon running: initialize the service and process the files here
+        try:
+            from src.services.code_graph_service import CodeGraphService
+        except ImportError:
+            from services.code_graph_service import CodeGraphService
         service = CodeGraphService()
-        service.process_file(
-            file_path=file_path, 
-            source_code=source_code,
+        service.process_files(
+            files,
             commit_hash=args.commit_hash,
             commit_author=args.commit_author
         )
-        print(f"✓ Successfully processed {file_path}")
+        print(f"✓ Successfully processed {label}")
         if args.commit_hash:
             print(f"✓ Linked to commit {args.commit_hash}")
     except Exception as e:
-        print(f"✗ Error processing {file_path}: {e}")
+        print(f"✗ Error processing {label}: {e}")
         sys.exit(1)
 
 if __name__ == "__main__":
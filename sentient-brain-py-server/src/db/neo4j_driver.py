@@ -1,39 +1,213 @@
 import os
-from neo4j import GraphDatabase, Driver
+import logging
+import asyncio
+import threading
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+from neo4j import GraphDatabase, Driver, AsyncGraphDatabase, AsyncDriver, AsyncSession
 from dotenv import load_dotenv
 
 # Load environment variables from .env file (make sure it's in the root directory)
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Sessions always name their database; without one the driver first asks the
+# server for the user's home database, an extra round-trip per session
+NEO4J_DATABASE = os.getenv("NEO4J_DATABASE", "neo4j")
+
+def _connection_config() -> tuple[str, tuple[str, str]]:
+    uri = os.getenv("NEO4J_URI")
+    user = os.getenv("NEO4J_USERNAME")
+    password = os.getenv("NEO4J_PASSWORD")
+
+    if not all([uri, user, password]):
+        raise ValueError("NEO4J_URI, NEO4J_USERNAME, and NEO4J_PASSWORD must be set in the environment.")
+    return uri, (user, password)
+
+def _pool_settings() -> dict:
+    """Connection pool settings for the shared driver, overridable via env.
+
+    Sessions from the API, the file watcher's worker pool and the CLI all
+    borrow from this pool; connections older than the lifetime are replaced
+    (recycling before Aura's idle cut-off) and TCP keep-alive stays on.
+    """
+    return {
+        "max_connection_pool_size": int(os.getenv("NEO4J_MAX_POOL_SIZE", "50")),
+        "connection_acquisition_timeout": float(os.getenv("NEO4J_ACQUISITION_TIMEOUT", "30")),
+        "max_connection_lifetime": float(os.getenv("NEO4J_MAX_CONNECTION_LIFETIME", "1800")),
+        "keep_alive": True,
+    }
+
 class Neo4jDriver:
     _driver: Driver = None
+    _lock = threading.Lock()
 
     def get_driver(self) -> Driver:
         if self._driver is None:
-            uri = os.getenv("NEO4J_URI")
-            user = os.getenv("NEO4J_USERNAME")
-            password = os.getenv("NEO4J_PASSWORD")
-
-            if not all([uri, user, password]):
-                raise ValueError("NEO4J_URI, NEO4J_USERNAME, and NEO4J_PASSWORD must be set in the environment.")
-
-            try:
-                self._driver = GraphDatabase.driver(uri, auth=(user, password))
-                self._driver.verify_connectivity()
-                print("Successfully connected to Neo4j.", flush=True)
-            except Exception as e:
-                print(f"Failed to connect to Neo4j: {e}", flush=True)
-                raise
+            with self._lock:
+                # Watcher workers may race here on first use; create one driver only
+                if self._driver is None:
+                    self._driver = self._create_driver()
         return self._driver
 
+    def _create_driver(self) -> Driver:
+        uri, auth = _connection_config()
+
+        try:
+            driver = GraphDatabase.driver(uri, auth=auth, **_pool_settings())
+            driver.verify_connectivity()
+            logger.info("Successfully connected to Neo4j.")
+            return driver
+        except Exception as e:
+            logger.error(f"Failed to connect to Neo4j: {e}")
+            raise
+
     def close(self):
         if self._driver is not None:
             self._driver.close()
             self._driver = None
-            print("Neo4j connection closed.", flush=True)
+            logger.info("Neo4j connection closed.")
+
+# Every code-graph node carries this label (plus one per node type, e.g.
+# `:File`) so MERGE/MATCH on `id` use the index instead of scanning all nodes
+CODE_NODE_LABEL = "CodeNode"
+
+SCHEMA_QUERIES = (
+    f"CREATE INDEX code_node_id IF NOT EXISTS FOR (n:{CODE_NODE_LABEL}) ON (n.id)",
+    # Nodes written before the label existed; a no-op once backfilled
+    f"""
+    MATCH (n) WHERE n.node_type IS NOT NULL AND NOT n:{CODE_NODE_LABEL}
+    CALL {{ WITH n SET n:{CODE_NODE_LABEL} }} IN TRANSACTIONS OF 10000 ROWS
+    """,
+)
+
+
+def ensure_neo4j_schema():
+    """Create the code-graph index (idempotent); run once at startup."""
+    with get_neo4j_session() as session:
+        for query in SCHEMA_QUERIES:
+            session.run(query).consume()
+    logger.info("Neo4j code graph index ensured.")
+
+
+class Neo4jBatcher:
+    """Buffers node and relationship writes and flushes them as UNWIND batches.
+
+    One `UNWIND` statement per node type and per relationship type replaces a
+    Bolt round-trip per symbol. Rows are kept column-wise (parallel lists of
+    ids and property maps) rather than as one small map per row, which is
+    less to build here and less for the driver to encode. Rows are sent in
+    chunks of `batch_size` to keep individual messages reasonably sized;
+    pass `flush` to `session.execute_write` to write everything in one
+    transaction.
+    """
+
+    # Labels and relationship types cannot be parameterised, so one statement per type
+    NODE_QUERY = """
+        UNWIND range(0, size($ids) - 1) AS i
+        MERGE (n:%s {id: $ids[i]})
+        SET n += $props[i], n.node_type = $node_type, n:%s
+    """
+    REL_QUERY = """
+        UNWIND range(0, size($source_ids) - 1) AS i
+        MATCH (a:%s {id: $source_ids[i]}), (b:%s {id: $target_ids[i]})
+        MERGE (a)-[r:%s {type: $rel_type}]->(b)
+        SET r += $props[i]
+    """
+
+    def __init__(self, batch_size: int = 5000):
+        self.batch_size = batch_size
+        # node type -> {"ids": [...], "props": [...]}
+        self.nodes: dict[str, dict[str, list]] = {}
+        # relationship type -> {"source_ids": [...], "target_ids": [...], "props": [...]}
+        self.relationships: dict[str, dict[str, list]] = {}
+
+    def add_node(self, node_id: str, node_type: str, props: dict):
+        columns = self.nodes.get(node_type)
+        if columns is None:
+            columns = self.nodes[node_type] = {"ids": [], "props": []}
+        columns["ids"].append(node_id)
+        columns["props"].append(props)
+
+    def add_rel(self, rel_type: str, source_id: str, target_id: str, props: dict | None = None):
+        columns = self.relationships.get(rel_type)
+        if columns is None:
+            columns = self.relationships[rel_type] = {"source_ids": [], "target_ids": [], "props": []}
+        columns["source_ids"].append(source_id)
+        columns["target_ids"].append(target_id)
+        columns["props"].append(props or {})
 
-# Singleton instance
+    @property
+    def node_count(self) -> int:
+        return sum(len(columns["ids"]) for columns in self.nodes.values())
+
+    @property
+    def relationship_count(self) -> int:
+        return sum(len(columns["source_ids"]) for columns in self.relationships.values())
+
+    def flush(self, tx):
+        """Write buffered nodes, then relationships (which match on them).
+
+        `tx` is a session or a transaction; buffers are only cleared once
+        everything was written, so a retried transaction replays in full.
+        """
+        for node_type, columns in self.nodes.items():
+            # FILE -> :File, CLASS -> :Class, ...
+            query = self.NODE_QUERY % (CODE_NODE_LABEL, node_type.capitalize())
+            self._run_batches(tx, query, columns, node_type=node_type)
+        for rel_type, columns in self.relationships.items():
+            query = self.REL_QUERY % (CODE_NODE_LABEL, CODE_NODE_LABEL, rel_type)
+            self._run_batches(tx, query, columns, rel_type=rel_type)
+        self.nodes = {}
+        self.relationships = {}
+
+    def _run_batches(self, tx, query: str, columns: dict[str, list], **params):
+        size = len(columns["props"])
+        for start in range(0, size, self.batch_size):
+            end = start + self.batch_size
+            tx.run(query, **{name: values[start:end] for name, values in columns.items()}, **params).consume()
+
+class AsyncNeo4jDriver:
+    """Async counterpart of `Neo4jDriver` for use on the API event loop.
+
+    Queries awaited on this driver do not block the loop, so concurrent
+    requests (and independent queries within one request) overlap their
+    round-trips. Threads outside the loop (file watcher, CLI) keep using
+    the sync driver.
+    """
+    _driver: AsyncDriver = None
+    _lock = asyncio.Lock()
+
+    async def get_driver(self) -> AsyncDriver:
+        if self._driver is None:
+            async with self._lock:
+                if self._driver is None:
+                    self._driver = await self._create_driver()
+        return self._driver
+
+    async def _create_driver(self) -> AsyncDriver:
+        uri, auth = _connection_config()
+
+        driver = AsyncGraphDatabase.driver(uri, auth=auth, **_pool_settings())
+        try:
+            await driver.verify_connectivity()
+            logger.info("Successfully connected to Neo4j (async).")
+            return driver
+        except Exception as e:
+            await driver.close()
+            logger.error(f"Failed to connect to Neo4j (async): {e}")
+            raise
+
+    async def close(self):
+        if self._driver is not None:
+            await self._driver.close()
+            self._driver = None
+            logger.info("Neo4j async connection closed.")
+
+# Singleton instances
 neo4j_driver = Neo4jDriver()
+async_neo4j_driver = AsyncNeo4jDriver()
 
 def get_neo4j_driver() -> Driver:
     return neo4j_driver.get_driver()
@@ -44,5 +218,17 @@ def close_neo4j_driver():
 # This function is what CodeGraphService expects
 def get_neo4j_session():
     driver = get_neo4j_driver()
-    db_name = os.getenv("NEO4J_DATABASE", "neo4j")
-    return driver.session(database=db_name)
+    return driver.session(database=NEO4J_DATABASE)
+
+async def get_async_neo4j_driver() -> AsyncDriver:
+    return await async_neo4j_driver.get_driver()
+
+async def close_async_neo4j_driver():
+    await async_neo4j_driver.close()
+
+@asynccontextmanager
+async def get_async_neo4j_session() -> AsyncIterator[AsyncSession]:
+    """Async counterpart of `get_neo4j_session`: `async with get_async_neo4j_session() as s:`."""
+    driver = await get_async_neo4j_driver()
+    async with driver.session(database=NEO4J_DATABASE) as session:
+        yield session
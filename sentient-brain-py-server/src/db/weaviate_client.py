@@ -1,57 +1,99 @@
 import os
+import logging
 import time
+import threading
 import weaviate
+from weaviate.auth import AuthApiKey
 from weaviate.client import WeaviateClient
 from dotenv import load_dotenv
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+READINESS_TIMEOUT = 60  # seconds to wait for a connected server to report ready
+MAX_READINESS_WAIT = 3  # cap on the backoff between readiness polls
+
 class WeaviateClientSingleton:
+    """Process-wide Weaviate client.
+
+    Every service shares this one client (and its HTTP/gRPC connections),
+    so the connect-and-wait-for-readiness cost is paid once per process.
+    """
     _client: WeaviateClient = None
+    _lock = threading.Lock()
 
     def get_client(self) -> WeaviateClient:
         if self._client is None:
-            retries = 10  # allow up to 30 s to establish TCP connection
-            delay = 3
-            for i in range(retries):
-                try:
-                    print(f"Attempting to connect to Weaviate ({i+1}/{retries})...", flush=True)
-                    connection_params = weaviate.connect.ConnectionParams.from_params(
-                        http_host=os.getenv("WEAVIATE_HOST", "weaviate"),
-                        http_port=int(os.getenv("WEAVIATE_PORT", 8080)),
-                        http_secure=False,
-                        grpc_host=os.getenv("WEAVIATE_HOST", "weaviate"),
-                        grpc_port=50051,
-                        grpc_secure=False,
-                    )
-                    self._client = weaviate.WeaviateClient(connection_params)
-                    self._client.connect()
-
-                    # Poll the readiness endpoint – Weaviate may still be starting up
-                    readiness_retries = 20  # total ~60 s (20×3s)
-                    for j in range(readiness_retries):
-                        try:
-                            if self._client.is_ready():
-                                print("Weaviate is ready.", flush=True)
-                                return self._client
-                        except Exception as re:
-                            # is_ready() will raise until the server is actually up
-                            print(f"Readiness check failed: {re}", flush=True)
-
-                        print("Weaviate not ready yet, waiting 3 s...", flush=True)
-                        time.sleep(3)
-
-                    raise RuntimeError("Weaviate did not become ready within the expected time window.")
-                except Exception as e:
-                    print(f"Failed to connect to Weaviate (attempt {i+1}/{retries}): {e}", flush=True)
-                    if i < retries - 1:
-                        print(f"Retrying in {delay} seconds...", flush=True)
-                        time.sleep(delay)
-                    else:
-                        print("Could not connect to Weaviate after several retries.", flush=True)
-                        raise
+            with self._lock:
+                # Watcher workers and request threads may race on first use
+                if self._client is None:
+                    self._client = self._connect_with_retries()
         return self._client
 
+    def _connect_with_retries(self) -> WeaviateClient:
+        retries = 10  # allow up to 30 s to establish TCP connection
+        delay = 3
+        for i in range(retries):
+            client = None
+            try:
+                logger.info(f"Attempting to connect to Weaviate ({i+1}/{retries})...")
+                client = self._connect()
+
+                # Poll the readiness endpoint – Weaviate may still be starting up.
+                # Back off from 0.1 s up to 3 s so a warm server is picked up
+                # almost immediately, within the same ~60 s window as before.
+                deadline = time.monotonic() + READINESS_TIMEOUT
+                wait = 0.1
+                while True:
+                    try:
+                        if client.is_ready():
+                            logger.info("Weaviate is ready.")
+                            return client
+                    except Exception as re:
+                        # is_ready() will raise until the server is actually up
+                        logger.warning(f"Readiness check failed: {re}")
+
+                    if time.monotonic() + wait > deadline:
+                        break
+                    logger.info(f"Weaviate not ready yet, waiting {wait:.1f} s...")
+                    time.sleep(wait)
+                    wait = min(wait * 2, MAX_READINESS_WAIT)
+
+                raise RuntimeError("Weaviate did not become ready within the expected time window.")
+            except Exception as e:
+                if client is not None:
+                    client.close()
+                logger.error(f"Failed to connect to Weaviate (attempt {i+1}/{retries}): {e}")
+                if i < retries - 1:
+                    logger.warning(f"Retrying in {delay} seconds...")
+                    time.sleep(delay)
+                else:
+                    logger.error("Could not connect to Weaviate after several retries.")
+                    raise
+
+    def _connect(self) -> WeaviateClient:
+        wcs_cluster_url = os.getenv("WCS_CLUSTER_URL")
+        wcs_api_key = os.getenv("WCS_API_KEY")
+        if wcs_cluster_url and wcs_api_key:
+            # Weaviate Cloud Services takes priority when configured
+            return weaviate.connect_to_wcs(
+                cluster_url=wcs_cluster_url,
+                auth_credentials=AuthApiKey(api_key=wcs_api_key),
+            )
+
+        connection_params = weaviate.connect.ConnectionParams.from_params(
+            http_host=os.getenv("WEAVIATE_HOST", "weaviate"),
+            http_port=int(os.getenv("WEAVIATE_PORT", 8080)),
+            http_secure=False,
+            grpc_host=os.getenv("WEAVIATE_HOST", "weaviate"),
+            grpc_port=50051,
+            grpc_secure=False,
+        )
+        client = weaviate.WeaviateClient(connection_params)
+        client.connect()
+        return client
+
     def close(self):
         if self._client is not None:
             self._client.close()
@@ -61,3 +103,6 @@ weaviate_client_singleton = WeaviateClientSingleton()
 
 def get_weaviate_client() -> WeaviateClient:
     return weaviate_client_singleton.get_client()
+
+def close_weaviate_client():
+    weaviate_client_singleton.close()
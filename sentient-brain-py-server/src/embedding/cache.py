@@ -0,0 +1,151 @@
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from pathlib import Path
+
+from .embedder import Embedder
+
+try:
+    from blake3 import blake3 as _hasher
+except ImportError:  # pragma: no cover - blake3 is optional
+    from hashlib import sha256 as _hasher
+
+
+# Cache hits keep their access time in memory until the next store, or until
+# this many are pending; a read-mostly cache then rarely writes
+TOUCH_FLUSH_SIZE = 256
+
+# Fraction of `max_entries` the cache is trimmed to once it overflows, so the
+# row count is not taken again on every store
+EVICT_TO_FRACTION = 0.9
+
+
+def text_hash(text: str) -> str:
+    """Content hash used as the cache key for a text."""
+    return _hasher(text.encode("utf-8")).hexdigest()
+
+
+class CachedEmbedder(Embedder):
+    """Wraps another embedder with a persistent `(model, text hash) -> vector` cache.
+
+    Re-saving or re-processing a file mostly yields chunks whose text has not
+    changed; those are served from a local SQLite file and only the misses go
+    to the underlying provider. Keys include the model name, so switching
+    models never returns stale vectors. Failed (empty) embeddings are not
+    cached.
+    """
+
+    def __init__(self, embedder: Embedder, path: str | None = None, max_entries: int | None = None):
+        self.embedder = embedder
+        self.model_name = getattr(embedder, "model_name", type(embedder).__name__)
+        self.path = path or os.getenv(
+            "EMBEDDING_CACHE_PATH",
+            str(Path.home() / ".cache" / "sentient-brain" / "embeddings.sqlite3"),
+        )
+        self.max_entries = max_entries or int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "1000000"))
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        # Shared by the API threads and the file-watcher pool
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " model TEXT NOT NULL,"
+            " hash TEXT NOT NULL,"
+            " vector BLOB NOT NULL,"
+            " last_used REAL NOT NULL,"
+            " PRIMARY KEY (model, hash))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings (last_used)")
+        self._conn.commit()
+        # Row count estimate, raised on every store (over-counting replaced
+        # rows) and corrected by `_evict` once it passes `max_entries`
+        (self._count,) = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+        self._touched: dict[str, float] = {}  # hash -> last hit, not yet written
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        """Return cached vectors where available and embed only the misses."""
+        if not texts:
+            return []
+
+        hashes = [text_hash(text) for text in texts]
+        cached = self._lookup(set(hashes))
+
+        # Identical texts within one call are embedded once
+        misses: dict[str, str] = {}
+        for text, key in zip(texts, hashes):
+            if key not in cached and key not in misses:
+                misses[key] = text
+
+        if misses:
+            fresh = self.embedder.embed(list(misses.values()))
+            computed = dict(zip(misses.keys(), fresh))
+            self._store({key: vector for key, vector in computed.items() if vector})
+            cached.update(computed)
+
+        return [cached.get(key, []) for key in hashes]
+
+    def _lookup(self, hashes: set[str]) -> dict[str, list[float]]:
+        found: dict[str, list[float]] = {}
+        keys = list(hashes)
+        with self._lock:
+            # Stay well below SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                part = keys[start:start + 500]
+                placeholders = ",".join("?" * len(part))
+                rows = self._conn.execute(
+                    f"SELECT hash, vector FROM embeddings WHERE model = ? AND hash IN ({placeholders})",
+                    [self.model_name, *part],
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = array("f", blob).tolist()
+            now = time.time()
+            for key in found:
+                self._touched[key] = now
+            if len(self._touched) >= TOUCH_FLUSH_SIZE:
+                self._flush_touched()
+                self._conn.commit()
+        return found
+
+    def _store(self, vectors: dict[str, list[float]]) -> None:
+        if not vectors:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, hash, vector, last_used) VALUES (?, ?, ?, ?)",
+                [(self.model_name, key, array("f", vector).tobytes(), now) for key, vector in vectors.items()],
+            )
+            for key in vectors:
+                self._touched.pop(key, None)
+            self._flush_touched()
+            self._count += len(vectors)
+            if self._count > self.max_entries:
+                self._evict()
+            self._conn.commit()
+
+    def _flush_touched(self) -> None:
+        """Write pending hit times; called with the lock held, before a commit."""
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE embeddings SET last_used = ? WHERE model = ? AND hash = ?",
+                [(last_used, self.model_name, key) for key, last_used in self._touched.items()],
+            )
+            self._touched.clear()
+
+    def _evict(self) -> None:
+        """Trim the least recently used rows to `EVICT_TO_FRACTION` of `max_entries`
+        if the cache really exceeds it (hit times are flushed first)."""
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+        if count > self.max_entries:
+            excess = count - int(self.max_entries * EVICT_TO_FRACTION)
+            self._conn.execute(
+                "DELETE FROM embeddings WHERE rowid IN"
+                " (SELECT rowid FROM embeddings ORDER BY last_used, rowid LIMIT ?)",
+                (excess,),
+            )
+            count -= excess
+        self._count = count
@@ -1,4 +1,7 @@
 import os
+import time
+import functools
+import threading
 from abc import ABC, abstractmethod
 
 class Embedder(ABC):
@@ -9,26 +12,75 @@ class Embedder(ABC):
         """Generates embeddings for a list of texts."""
         pass
 
+# How long a fallback choice is kept before the configured provider is probed again
+EMBEDDER_HEALTH_INTERVAL = float(os.getenv("EMBEDDER_HEALTH_INTERVAL", "300"))
+
+_lock = threading.Lock()
+_provider: Embedder | None = None  # the selected provider, unwrapped
+_embedder: Embedder | None = None  # what callers receive (possibly cache-wrapped)
+_caches: dict[str, Embedder] = {}  # model name -> its cache wrapper, kept across switches
+_recheck_at: float | None = None  # set only while running on the fallback
+
 def get_embedder() -> Embedder:
-    """Factory function to get the configured embedding provider with fallback."""
+    """Return the process-wide embedding provider, choosing it with fallback.
+
+    The choice is memoized, so the quota probe runs once rather than once
+    per caller. If the configured provider failed and the local model is in
+    use, the configured provider is probed again after
+    `EMBEDDER_HEALTH_INTERVAL` seconds.
+
+    Unless `EMBEDDING_CACHE=false`, the provider is wrapped in a persistent
+    content-hash cache so unchanged chunks are not re-embedded. Callers
+    should call this per batch rather than keep the result, so they follow
+    a switch back from the fallback.
+    """
+    global _provider, _embedder, _recheck_at
+    with _lock:
+        if _embedder is None or (_recheck_at is not None and time.monotonic() >= _recheck_at):
+            provider, is_fallback = _create_embedder()
+            _recheck_at = time.monotonic() + EMBEDDER_HEALTH_INTERVAL if is_fallback else None
+            if provider is not _provider:
+                _provider = provider
+                _embedder = _with_cache(provider)
+        return _embedder
+
+def _with_cache(embedder: Embedder) -> Embedder:
+    if os.getenv("EMBEDDING_CACHE", "true").lower() in ("0", "false", "no"):
+        return embedder
+    from .cache import CachedEmbedder
+    model_name = getattr(embedder, "model_name", type(embedder).__name__)
+    cached = _caches.get(model_name)
+    if cached is None:
+        cached = _caches[model_name] = CachedEmbedder(embedder)
+    else:
+        # Same model, so the cached vectors still apply; reuse the connection
+        cached.embedder = embedder
+    return cached
+
+@functools.lru_cache(maxsize=1)
+def _local_hf_embedder() -> Embedder:
+    # Loading the model is expensive; reuse it across fallback re-checks
+    from .local_hf import LocalHFEmbedder
+    return LocalHFEmbedder()
+
+def _create_embedder() -> tuple[Embedder, bool]:
+    """Build the configured provider; returns (embedder, is_fallback)."""
     provider = os.getenv("EMBEDDING_PROVIDER", "gemini").lower()
 
     if provider == "gemini":
         try:
             from .gemini import GeminiEmbedder
             embedder = GeminiEmbedder()
-            # Test with a small embedding to check quota
-            test_result = embedder.embed(["test"])
+            # Probe with a one-character text to check quota cheaply
+            test_result = embedder.embed(["a"])
             if not test_result or not test_result[0]:
                 raise Exception("Gemini embedder returned empty result - likely quota exhausted")
-            return embedder
+            return embedder, False
         except Exception as e:
             print(f"[EMBEDDER] Gemini failed ({e}), falling back to local HF model", flush=True)
             # Fall back to local HuggingFace model
-            from .local_hf import LocalHFEmbedder
-            return LocalHFEmbedder()
+            return _local_hf_embedder(), True
     elif provider == "local_hf":
-        from .local_hf import LocalHFEmbedder
-        return LocalHFEmbedder()
+        return _local_hf_embedder(), False
     else:
         raise ValueError(f"Unsupported embedding provider: {provider}")
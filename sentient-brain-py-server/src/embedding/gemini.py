@@ -1,4 +1,5 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
 import google.genai as genai
 from .embedder import Embedder
 
@@ -18,14 +19,36 @@ class GeminiEmbedder(Embedder):
             raise ValueError("GEMINI_API_KEY environment variable not set.")
         # New pattern (>= v1.20): instantiate a client per API key.
         self.client = genai.Client(api_key=api_key)
+        # Documents per embed_content request (API maximum is 96)
+        self.batch_size = max(1, min(96, int(os.getenv("GEMINI_EMBED_BATCH", "96"))))
+        # Batch requests in flight at once; hides per-request latency on large inputs
+        self.concurrency = max(1, int(os.getenv("GEMINI_EMBED_CONCURRENCY", "8")))
+        # Created up front: embed() runs on several watcher threads at once
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="gemini-embed")
 
     def embed(self, texts: list[str]) -> list[list[float]]:
         """Generate embeddings for a batch of texts.
 
-        Uses the `batch_embed_contents` endpoint (introduced mid-2024) which
-        accepts up to 96 documents per call and is more cost-efficient than
-        individual `embed_content` calls.
+        The endpoint accepts up to 96 documents per call, so longer inputs are
+        split into requests of `GEMINI_EMBED_BATCH` texts (default 96) and the
+        results concatenated in order. A failed request yields empty vectors
+        for its texts only.
         """
+        batches = self._split(texts)
+        if len(batches) <= 1:
+            return self._embed_batch(batches[0]) if batches else []
+
+        # Several requests: issue up to `concurrency` of them at once
+        embeddings: list[list[float]] = []
+        for batch_embeddings in self._executor.map(self._embed_batch, batches):
+            embeddings.extend(batch_embeddings)
+        return embeddings
+
+    def _split(self, texts: list[str]) -> list[list[str]]:
+        return [texts[start:start + self.batch_size] for start in range(0, len(texts), self.batch_size)]
+
+    def _embed_batch(self, texts: list[str]) -> list[list[float]]:
+        """Embed at most `batch_size` texts with a single API call."""
         try:
             # The new SDK uses `embed_content`; it accepts either a single string or a list of strings.
             response = self.client.models.embed_content(
@@ -1,15 +1,125 @@
+import os
+import json
+import shutil
+from pathlib import Path
+import numpy as np
+import torch
 from .embedder import Embedder
 from sentence_transformers import SentenceTransformer
 
+ONNX_CACHE_DIR = Path(os.getenv("LOCAL_HF_ONNX_DIR", str(Path.home() / ".cache" / "sentient-brain" / "onnx")))
+
 class LocalHFEmbedder(Embedder):
-    """Embedding provider using local Hugging Face Sentence-Transformers models."""
+    """Embedding provider using local Hugging Face Sentence-Transformers models.
+
+    With `LOCAL_HF_INT8=1` and `optimum[onnxruntime]` installed, the model is
+    exported to ONNX and dynamically quantized to int8 (VNNI kernels on
+    recent x86 CPUs) instead of running eager PyTorch.
+    """
 
     def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
+        self.model_name = model_name
+        self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        self.batch_size = int(os.getenv("LOCAL_HF_EMBED_BATCH", "64"))
+        self.onnx_model = None
+        self.max_seq_length: int | None = None
+        self.model = None
+
+        if os.getenv("LOCAL_HF_INT8", "0").lower() in ("1", "true", "yes") and self.device == "cpu":
+            try:
+                self._load_onnx_int8(model_name)
+                # Quantized vectors differ slightly; keep them apart in the embedding cache
+                self.model_name = f"{model_name}:onnx-int8"
+                print(f"[EMBEDDER] Using int8 ONNX Runtime backend for {model_name}", flush=True)
+                return
+            except ImportError as e:
+                print(f"[EMBEDDER] LOCAL_HF_INT8 set but optimum/onnxruntime unavailable ({e}); using PyTorch", flush=True)
+            except Exception as e:
+                # Download, export or quantization failed; the PyTorch path still works
+                self.onnx_model = None
+                print(f"[EMBEDDER] int8 ONNX backend failed to load ({e}); using PyTorch", flush=True)
+
         # Load model; this will download the model on first run
-        self.model = SentenceTransformer(model_name)
+        self.model = SentenceTransformer(model_name, device=self.device)
+        if self.device == "cuda":
+            # FP16 halves memory traffic; embedding quality is unaffected in practice
+            self.model.half()
+
+    def _load_onnx_int8(self, model_name: str):
+        """Export and quantize once into ONNX_CACHE_DIR, then load the int8 model."""
+        from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+        from transformers import AutoTokenizer
+
+        # Short sentence-transformers names need their hub namespace here
+        hub_id = model_name if "/" in model_name else f"sentence-transformers/{model_name}"
+        export_dir = ONNX_CACHE_DIR / hub_id.replace("/", "--")
+        quantized_dir = export_dir / "int8"
+
+        if not (quantized_dir / "model_quantized.onnx").exists():
+            model = ORTModelForFeatureExtraction.from_pretrained(hub_id, export=True)
+            model.save_pretrained(export_dir)
+            quantizer = ORTQuantizer.from_pretrained(export_dir)
+            quantizer.quantize(
+                save_dir=quantized_dir,
+                quantization_config=AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False),
+            )
+            AutoTokenizer.from_pretrained(hub_id).save_pretrained(quantized_dir)
+
+        self.max_seq_length = self._max_seq_length(hub_id, quantized_dir)
+        self.tokenizer = AutoTokenizer.from_pretrained(quantized_dir)
+        self.onnx_model = ORTModelForFeatureExtraction.from_pretrained(
+            quantized_dir, file_name="model_quantized.onnx", provider="CPUExecutionProvider"
+        )
+
+    @staticmethod
+    def _max_seq_length(hub_id: str, quantized_dir: Path) -> int | None:
+        """sentence-transformers' truncation length for the model.
+
+        It is usually below the tokenizer's `model_max_length` (256 vs 512 for
+        all-MiniLM-L6-v2), so it must be passed explicitly for long chunks to
+        be embedded from the same input on both paths.
+        """
+        config_path = quantized_dir / "sentence_bert_config.json"
+        if not config_path.exists():
+            from huggingface_hub import hf_hub_download
+            shutil.copy(hf_hub_download(hub_id, "sentence_bert_config.json"), config_path)
+        return json.loads(config_path.read_text()).get("max_seq_length")
+
+    def _encode_onnx(self, texts: list[str]) -> np.ndarray:
+        """Mean-pool and L2-normalize, matching sentence-transformers' output."""
+        batches = []
+        for start in range(0, len(texts), self.batch_size):
+            inputs = self.tokenizer(
+                texts[start:start + self.batch_size],
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors="pt",
+            )
+            token_embeddings = self.onnx_model(**inputs).last_hidden_state.detach().numpy()
+            mask = inputs["attention_mask"].numpy()[..., None].astype(np.float32)
+            pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            batches.append(pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None))
+        return np.concatenate(batches)
+
+    def embed_array(self, texts: list[str]) -> np.ndarray:
+        """Generates normalized float32 embeddings as a single (n, dim) array."""
+        if self.onnx_model is not None:
+            embeddings = self._encode_onnx(texts)
+        else:
+            embeddings = self.model.encode(
+                texts,
+                batch_size=self.batch_size,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False,
+            )
+        return embeddings.astype(np.float32, copy=False)
 
     def embed(self, texts: list[str]) -> list[list[float]]:
         """Generates embeddings for a list of texts using a local HF model."""
-        # Returns list of embeddings as Python lists
-        embeddings = self.model.encode(texts, convert_to_numpy=True)
-        return embeddings.tolist()
+        if not texts:
+            return []
+        # Convert to Python lists once, at the Embedder boundary
+        return self.embed_array(texts).tolist()
@@ -32,20 +32,28 @@ class GeminiGenerative:
             or "gemini-2.5-flash-lite-preview-06-17"
         )
 
+        # One client per instance; model calls go through `client.models`
         self.client = genai.Client(api_key=api_key)
-        # The unified GenAI SDK exposes `GenerativeModel` via the client
-        self.model = self.client.GenerativeModel(model_name=model_name)
+        self.model_name = model_name
 
     # ---------------------------------------------------------------------
     # Convenience helpers
     # ---------------------------------------------------------------------
     def generate_text(self, prompt: str, **kwargs) -> str:
         """Return the model's text response for a single prompt."""
-        response = self.model.generate_content(prompt, **kwargs)
-        # `generate_content` returns a GenerativeResponse; join parts as text
-        return "".join(part.text for part in response.candidates[0].content.parts)
+        response = self.client.models.generate_content(
+            model=self.model_name, contents=prompt, **kwargs
+        )
+        return _response_text(response)
 
     def chat_stream(self, prompt: str, **kwargs):
         """Yield streamed chunks for real-time chat UIs."""
-        for chunk in self.model.generate_content_stream(prompt, **kwargs):
-            yield "".join(part.text for part in chunk.candidates[0].content.parts)
+        for chunk in self.client.models.generate_content_stream(
+            model=self.model_name, contents=prompt, **kwargs
+        ):
+            yield _response_text(chunk)
+
+
+def _response_text(response) -> str:
+    """Join the text parts of the first candidate of a GenerateContentResponse."""
+    return "".join(part.text or "" for part in response.candidates[0].content.parts)
@@ -1,34 +1,75 @@
 import os
+import time
+import asyncio
+import logging
+import threading
 from fastapi import FastAPI, Depends
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
 from typing import Optional, List
 
 from .services.ingestion_service import IngestionService
-from .services.code_graph_service import CodeGraphService
+from .services.code_graph_service import CodeGraphService, shutdown_parser_pool
 from .services.file_watcher import FileWatcherService
+from .cli.ingest_daemon import IngestDaemon
 from .services.groq_agentic_service import get_groq_service, SearchSettings
 from .services.weaviate_inspector import get_weaviate_inspector
-from .db.neo4j_driver import get_neo4j_driver, close_neo4j_driver, get_neo4j_session
-from .db.weaviate_client import get_weaviate_client
+from .db.neo4j_driver import (
+    close_neo4j_driver,
+    get_async_neo4j_driver,
+    close_async_neo4j_driver,
+    get_async_neo4j_session,
+    ensure_neo4j_schema,
+)
+from .db.weaviate_client import get_weaviate_client, close_weaviate_client
 from .models.document_models import DocumentSource, DocumentType, IngestionStatus
 
-# Dependency to get the ingestion service
+# Module loggers (db drivers, parsers) log at LOG_LEVEL; the Neo4j and Weaviate
+# SDKs are kept to warnings so they don't flood the output
+logging.basicConfig(
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
+    format="%(asctime)s %(levelname)s [%(name)s] %(message)s",
+)
+logging.getLogger("neo4j").setLevel(logging.WARNING)
+logging.getLogger("weaviate").setLevel(logging.WARNING)
+
+_ingestion_service: IngestionService | None = None
+_ingestion_service_lock = threading.Lock()
+
+# Dependency to get the (shared) ingestion service; sync endpoints resolve it
+# from the threadpool, so creation is guarded
 def get_ingestion_service():
-    return IngestionService()
-    # On startup
+    global _ingestion_service
+    if _ingestion_service is None:
+        with _ingestion_service_lock:
+            if _ingestion_service is None:
+                _ingestion_service = IngestionService()
+    return _ingestion_service
+
+def _initialize_weaviate_schema():
+    ingestion_service = get_ingestion_service()
+    ingestion_service.initialize_schema(recreate=True)
+    print("Schema initialization complete.", flush=True)
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # On startup
     print("Initializing application...", flush=True)
     try:
-        # Initialize Weaviate
-        ingestion_service = get_ingestion_service()
-        ingestion_service.initialize_schema(recreate=True)
-        print("Schema initialization complete.", flush=True)
+        # Weaviate (readiness wait + schema) and Neo4j connect independently;
+        # run them concurrently so startup costs the slower of the two
+        await asyncio.gather(
+            asyncio.to_thread(_initialize_weaviate_schema),
+            asyncio.to_thread(ensure_neo4j_schema), # Connects the sync driver (watcher, services)
+            get_async_neo4j_driver(), # Used by the async API endpoints
+        )
+
+        # Same instance the `Depends(get_ingestion_service)` endpoints receive
+        app.state.ingestion_service = get_ingestion_service()
 
-        # Initialize Neo4j and services that depend on it
-        get_neo4j_driver() # Establishes and verifies the connection
-        app.state.code_graph_service = CodeGraphService()
+        # Services that depend on both stores (constructor makes blocking calls)
+        app.state.code_graph_service = await asyncio.to_thread(CodeGraphService)
 
         # Initialize and start the file watcher
         watch_paths = os.getenv("WATCH_PATHS", "src").split(',')
@@ -39,37 +80,75 @@ async def lifespan(app: FastAPI):
         app.state.file_watcher.start()
         print("CodeGraphService initialized.", flush=True)
 
+        # Serve the process_file CLI (git hook) from this warm process
+        if os.getenv("INGEST_DAEMON", "true").lower() not in ("0", "false", "no"):
+            app.state.ingest_daemon = IngestDaemon(app.state.code_graph_service)
+            app.state.ingest_daemon.start()
+
     except Exception as e:
         print(f"An error occurred during startup: {e}", flush=True)
     
     yield
     
     # On shutdown
+    if hasattr(app.state, 'ingest_daemon') and app.state.ingest_daemon:
+        app.state.ingest_daemon.stop()
     if hasattr(app.state, 'file_watcher') and app.state.file_watcher:
         app.state.file_watcher.stop()
+    shutdown_parser_pool()
     close_neo4j_driver()
+    await close_async_neo4j_driver()
+    close_weaviate_client()
     print("Application shutdown.", flush=True)
 
-app = FastAPI(title="Sentient Brain Python Server", lifespan=lifespan)
+# orjson encodes the large inspector/export/context payloads several times
+# faster than the stdlib encoder
+app = FastAPI(
+    title="Sentient Brain Python Server",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 # -----------------------------
 # Health & Context Endpoints
 # -----------------------------
 
-from neo4j import Result  # type: ignore
 from weaviate.collections import Collection  # type: ignore
-
-
-def _get_neo4j_counts() -> dict:
+from weaviate.classes.query import Filter  # type: ignore
+
+# Both counts in one round-trip; each subquery is answered from the count store
+_CQL_COUNTS = """
+CALL { MATCH (n) RETURN count(n) AS nodes }
+CALL { MATCH ()-[r]->() RETURN count(r) AS relationships }
+RETURN nodes, relationships
+"""
+
+# Aggregated server-side: one row with de-duplicated nodes and relationships
+# instead of one row per (n, r, m) path
+_CQL_CONTEXT = """
+MATCH (f:CodeNode {id: $file})-[:CONTAINS*0..2]->(n)
+OPTIONAL MATCH (n)-[r]->(m)
+RETURN collect(DISTINCT n) AS ns,
+       collect(DISTINCT m) AS ms,
+       collect(DISTINCT {
+           id: elementId(r),
+           src: startNode(r).id,
+           dst: endNode(r).id,
+           props: properties(r),
+           type: type(r)
+       }) AS rs
+"""
+
+_COLLECTION_NAMES = ("CodeChunk", "DocumentChunk", "DocumentSource")
+
+
+async def _get_neo4j_counts() -> dict:
     """Returns node and relationship counts from Neo4j."""
     try:
-        with get_neo4j_session() as session:
-            node_count: Result = session.run("MATCH (n) RETURN count(n) AS c")
-            rel_count: Result = session.run("MATCH ()-[r]->() RETURN count(r) AS c")
-            return {
-                "nodes": node_count.single().get("c", 0),
-                "relationships": rel_count.single().get("c", 0),
-            }
+        async with get_async_neo4j_session() as session:
+            result = await session.run(_CQL_COUNTS)
+            record = await result.single()
+        return {"nodes": record["nodes"], "relationships": record["relationships"]}
     except Exception as exc:
         return {"error": str(exc)}
 
@@ -79,12 +158,11 @@ def _get_weaviate_counts() -> dict:
     try:
         client = get_weaviate_client()
         counts = {}
-        for cls in ["CodeChunk", "DocumentChunk", "DocumentSource"]:
+        for cls in _COLLECTION_NAMES:
             try:
+                # Server-side aggregate: one integer instead of every object
                 coll = client.collections.get(cls)
-                # Use fetch_objects with limit=0 to get count
-                result = coll.query.fetch_objects(limit=10000)  # Get actual objects
-                counts[cls] = len(result.objects) if hasattr(result, 'objects') else 0
+                counts[cls] = coll.aggregate.over_all(total_count=True).total_count
             except Exception as e:
                 print(f"[HEALTH] Error counting {cls}: {e}", flush=True)
                 counts[cls] = "error"
@@ -93,57 +171,85 @@ def _get_weaviate_counts() -> dict:
         return {"error": str(exc)}
 
 
+# Orchestrator probes can hit /health every second; serve bursts from memory
+HEALTH_CACHE_TTL = float(os.getenv("HEALTH_CACHE_TTL", "2"))
+_health_cache: dict = {"ts": 0.0, "val": None}
+_health_lock = asyncio.Lock()
+
+
 @app.get("/health", tags=["Health"])
-def health():
-    """Returns basic liveness plus DB counts."""
-    return {
-        "status": "ok",
-        "neo4j": _get_neo4j_counts(),
-        "weaviate": _get_weaviate_counts(),
-    }
+async def health():
+    """Returns basic liveness plus DB counts (cached for HEALTH_CACHE_TTL seconds)."""
+    async with _health_lock:
+        # Concurrent probes wait for one refresh instead of each querying the DBs
+        if _health_cache["val"] is None or time.monotonic() - _health_cache["ts"] >= HEALTH_CACHE_TTL:
+            # The Weaviate client is synchronous; keep it off the event loop
+            neo4j_counts, weaviate_counts = await asyncio.gather(
+                _get_neo4j_counts(),
+                run_in_threadpool(_get_weaviate_counts),
+            )
+            _health_cache["val"] = {
+                "status": "ok",
+                "neo4j": neo4j_counts,
+                "weaviate": weaviate_counts,
+            }
+            _health_cache["ts"] = time.monotonic()
+        return _health_cache["val"]
 
 
 @app.get("/context", tags=["Context"])
-def get_context(file: str):
+async def get_context(file: str):
     """Return code graph slice & code chunks for the given file path."""
     result = {"file": file, "nodes": [], "relationships": [], "chunks": []}
+    # Graph slice (Neo4j) and code chunks (Weaviate) are independent; fetch both at once
+    graph, chunks = await asyncio.gather(
+        _get_graph_slice(file),
+        run_in_threadpool(_get_file_chunks, file),
+        return_exceptions=True,
+    )
+
     # 1. Graph slice
-    try:
-        with get_neo4j_session() as session:
-            records = session.run(
-                """
-                MATCH (f {id: $file})-[:CONTAINS*0..2]->(n)
-                OPTIONAL MATCH (n)-[r]->(m)
-                RETURN n,r,m
-                """,
-                file=file,
-            )
-            for rec in records:
-                if rec["n"]:
-                    result["nodes"].append(rec["n"]._properties)
-                if rec["r"]:
-                    rel_props = rec["r"]._properties
-                    rel_props.update({"type": rec["r"].type})
-                    result["relationships"].append(rel_props)
-                if rec["m"]:
-                    result["nodes"].append(rec["m"]._properties)
-    except Exception as exc:
-        result["graph_error"] = str(exc)
+    if isinstance(graph, Exception):
+        result["graph_error"] = str(graph)
+    else:
+        result["nodes"], result["relationships"] = graph
 
     # 2. Code chunks from Weaviate
-    try:
-        client = get_weaviate_client()
-        code_chunk_coll = client.collections.get("CodeChunk")
-        # Simplified: Get all chunks, filter client-side for now
-        objs = code_chunk_coll.query.fetch_objects(limit=1000)
-        for ob in objs.objects:  # type: ignore
-            if ob.properties.get("file_path") == file:
-                result["chunks"].append(ob.properties)
-    except Exception as exc:
-        result["weaviate_error"] = str(exc)
+    if isinstance(chunks, Exception):
+        result["weaviate_error"] = str(chunks)
+    else:
+        result["chunks"] = chunks
 
     return result
 
+
+async def _get_graph_slice(file: str) -> tuple[list, list]:
+    async with get_async_neo4j_session() as session:
+        result = await session.run(_CQL_CONTEXT, file=file)
+        record = await result.single()
+
+    nodes = {}
+    for node in record["ns"] + record["ms"]:
+        nodes.setdefault(node.element_id, dict(node))
+    # One entry per relationship (keyed on its element id), with its endpoints
+    relationships = [
+        {**rel["props"], "type": rel["type"], "src": rel["src"], "dst": rel["dst"]}
+        for rel in record["rs"]
+        if rel["type"] is not None  # rows where OPTIONAL MATCH found no relationship
+    ]
+    return list(nodes.values()), relationships
+
+
+def _get_file_chunks(file: str) -> list:
+    client = get_weaviate_client()
+    code_chunk_coll = client.collections.get("CodeChunk")
+    # Filtered server-side on the file_path inverted index
+    objs = code_chunk_coll.query.fetch_objects(
+        filters=Filter.by_property("file_path").equal(file),
+        limit=1000,
+    )
+    return [ob.properties for ob in objs.objects]  # type: ignore
+
 # -------------------------------------------------
 
 from pydantic import BaseModel  # type: ignore
@@ -344,11 +450,26 @@ def advanced_reasoning_with_groq(
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
+# Overview/statistics scan whole collections; results are reused briefly
+INSPECTOR_CACHE_TTL = float(os.getenv("INSPECTOR_CACHE_TTL", "30"))
+_inspector_cache: dict[str, tuple[float, dict]] = {}
+_inspector_cache_lock = threading.Lock()
+
+def _cached_inspection(key: str, compute):
+    with _inspector_cache_lock:
+        cached = _inspector_cache.get(key)
+        if cached and time.monotonic() - cached[0] < INSPECTOR_CACHE_TTL:
+            return cached[1]
+    value = compute()
+    with _inspector_cache_lock:
+        _inspector_cache[key] = (time.monotonic(), value)
+    return value
+
 @app.get("/weaviate/overview", tags=["Weaviate Inspector"])
 def get_weaviate_overview():
     """Get comprehensive overview of Weaviate database contents."""
     inspector = get_weaviate_inspector()
-    return inspector.get_database_overview()
+    return _cached_inspection("overview", inspector.get_database_overview)
 
 @app.get("/weaviate/collection/{collection_name}", tags=["Weaviate Inspector"])
 def get_collection_details(collection_name: str):
@@ -387,7 +508,7 @@ def get_code_chunks_for_file(file_path: str):
 def get_weaviate_statistics():
     """Get comprehensive statistics about all Weaviate collections."""
     inspector = get_weaviate_inspector()
-    return inspector.get_collection_statistics()
+    return _cached_inspection("statistics", inspector.get_collection_statistics)
 
 @app.get("/weaviate/export/{collection_name}", tags=["Weaviate Inspector"])
 def export_collection_data(collection_name: str):
@@ -1,9 +1,11 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from uuid import uuid4
 from typing import List, Dict, Any, Optional
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
 
+_UTC = timezone.utc
+
 class DocumentType(str, Enum):
     MARKDOWN = "MARKDOWN"
     SOURCE_CODE = "SOURCE_CODE"
@@ -18,16 +20,20 @@ class IngestionStatus(str, Enum):
     FAILED = "FAILED"
 
 class DocumentSource(BaseModel):
+    model_config = ConfigDict(extra="ignore", validate_assignment=False)
+
     id: str = Field(default_factory=lambda: str(uuid4()), description="Unique identifier")
     title: Optional[str] = None
     uri: Optional[str] = None
     document_type: DocumentType
     tech_stack: List[str] = []
-    last_crawled_at: datetime = Field(default_factory=datetime.utcnow)
+    last_crawled_at: datetime = Field(default_factory=lambda: datetime.now(_UTC))
     status: IngestionStatus = IngestionStatus.PENDING
     metadata: Dict[str, Any] = {}
 
 class DocumentChunk(BaseModel):
+    model_config = ConfigDict(extra="ignore", validate_assignment=False)
+
     id: str # Unique ID for the chunk, e.g., source_id:chunk_index
     source_id: str = Field(..., description="ID of the DocumentSource this chunk belongs to")
     content: str
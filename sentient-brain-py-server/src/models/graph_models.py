@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from dataclasses import dataclass
 from typing import List, Dict, Any, Optional
 from enum import Enum
 
@@ -20,16 +20,26 @@ class RelationshipType(str, Enum):
     DEFINES = "DEFINES"
     INSTANTIATES = "INSTANTIATES"
 
-class CodeNode(BaseModel):
+# Plain slotted dataclasses: parsers build one per class/function/import, from
+# trusted values, so pydantic validation and a per-instance __dict__ are overhead.
+# `metadata` is rarely set and defaults to None rather than a fresh empty dict
+@dataclass(slots=True)
+class CodeNode:
     id: str  # e.g., file_path for FILE, file_path:class_name for CLASS
     node_type: NodeType
     name: str
     start_line: int
     end_line: int
-    metadata: Dict[str, Any] = {}
+    metadata: Optional[Dict[str, Any]] = None
 
-class CodeRelationship(BaseModel):
+    def props(self) -> Dict[str, Any]:
+        """Neo4j properties of the node; `metadata` is left out since Neo4j
+        does not allow nested maps as property values."""
+        return {"name": self.name, "start_line": self.start_line, "end_line": self.end_line}
+
+@dataclass(slots=True)
+class CodeRelationship:
     source_id: str
     target_id: str
     type: RelationshipType
-    metadata: Dict[str, Any] = {}
+    metadata: Optional[Dict[str, Any]] = None
@@ -7,9 +7,83 @@ consume irrespective of language.
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from typing import List, Tuple
 
-from ..models.graph_models import CodeNode, CodeRelationship
+from tree_sitter import Tree
+
+from ..models.graph_models import CodeNode, CodeRelationship, NodeType
+
+
+def count_lines(source_code: str) -> int:
+    """Number of lines in `source_code`, as `len(source_code.splitlines())` for
+    newline-terminated text, without building the list of lines."""
+    return source_code.count("\n") + (1 if source_code and not source_code.endswith("\n") else 0)
+
+
+def _common_prefix_len(a: bytes, b: bytes) -> int:
+    """Length of the common prefix, by binary search over slice comparisons."""
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[:mid] == b[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _common_suffix_len(a: bytes, b: bytes, limit: int) -> int:
+    """Length of the common suffix, at most `limit` bytes."""
+    lo, hi = 0, limit
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[len(a) - mid:] == b[len(b) - mid:]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _point(source: bytes, offset: int) -> Tuple[int, int]:
+    """Tree-sitter (row, column) of a byte offset."""
+    row = source.count(b"\n", 0, offset)
+    return row, offset - (source.rfind(b"\n", 0, offset) + 1)
+
+
+def edit_tree(old_tree: Tree, old_bytes: bytes, new_bytes: bytes) -> None:
+    """Record the change from `old_bytes` to `new_bytes` on `old_tree`.
+
+    A save usually changes one contiguous region, so the edit is taken as the
+    span between the common prefix and suffix of the old and new bytes;
+    parsing `new_bytes` with the edited tree then only re-parses around it.
+    """
+    start = _common_prefix_len(old_bytes, new_bytes)
+    suffix = _common_suffix_len(old_bytes, new_bytes, min(len(old_bytes), len(new_bytes)) - start)
+    old_end = len(old_bytes) - suffix
+    new_end = len(new_bytes) - suffix
+    old_tree.edit(
+        start_byte=start,
+        old_end_byte=old_end,
+        new_end_byte=new_end,
+        start_point=_point(old_bytes, start),
+        old_end_point=_point(old_bytes, old_end),
+        new_end_point=_point(new_bytes, new_end),
+    )
+
+
+@dataclass(slots=True)
+class Scope:
+    """A file, class or function scope of a visitor.
+
+    Visitors keep their scopes in a list; `parent` is the index of the
+    enclosing scope, so entering and leaving a scope only moves an integer.
+    """
+
+    parent: int
+    node_id: str
+    node_type: NodeType
+    end_byte: int = 0
 
 
 class ICodeParser(ABC):
@@ -0,0 +1,132 @@
+import os
+import pickle
+import sqlite3
+import hashlib
+import threading
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+from ..models.graph_models import CodeNode, CodeRelationship
+
+# Bump whenever a parser's output for the same source changes (new node
+# types, different ids, ...); entries written by other versions are ignored
+PARSER_VERSION = 1
+
+ParseResult = Tuple[List[CodeNode], List[CodeRelationship]]
+
+# Hits record their access time in memory; the times are written with the
+# next put, or once this many hits are pending, instead of one commit per hit
+TOUCH_FLUSH_SIZE = 256
+
+# Eviction trims the cache to this fraction of `max_entries`, so the row
+# count is only taken again after many more puts
+EVICT_TO_FRACTION = 0.9
+
+
+class ParseCache:
+    """Persistent `(path, content hash, parser version) -> (nodes, relationships)` cache.
+
+    A re-index mostly sees files whose content has not changed since the last
+    run; their graph is loaded from a local SQLite file instead of being
+    parsed and visited again. Failed parses (no nodes) are not cached.
+    """
+
+    def __init__(self, path: str | None = None, max_entries: int | None = None):
+        self.path = path or os.getenv(
+            "PARSE_CACHE_PATH",
+            str(Path.home() / ".cache" / "sentient-brain" / "parse_cache.sqlite3"),
+        )
+        self.max_entries = max_entries or int(os.getenv("PARSE_CACHE_MAX_ENTRIES", "100000"))
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        # Shared by the API threads and the file-watcher pool
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS parse_cache ("
+            " key BLOB PRIMARY KEY,"
+            " payload BLOB NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_parse_cache_last_used ON parse_cache (last_used)")
+        self._conn.commit()
+        # Upper bound on the row count (replaced keys are counted again);
+        # the exact count is only taken once this passes `max_entries`
+        (self._count,) = self._conn.execute("SELECT COUNT(*) FROM parse_cache").fetchone()
+        self._touched: dict[bytes, float] = {}  # key -> last hit, not yet written
+
+    @staticmethod
+    def key(file_path: str, source_code: str) -> bytes:
+        digest = hashlib.sha256(source_code.encode("utf-8")).digest()
+        return digest + f"{PARSER_VERSION}:{file_path}".encode("utf-8")
+
+    def get(self, file_path: str, source_code: str) -> ParseResult | None:
+        key = self.key(file_path, source_code)
+        with self._lock:
+            row = self._conn.execute("SELECT payload FROM parse_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._touched[key] = time.time()
+            if len(self._touched) >= TOUCH_FLUSH_SIZE:
+                self._flush_touched()
+                self._conn.commit()
+        return pickle.loads(row[0])
+
+    def put(self, file_path: str, source_code: str, result: ParseResult) -> None:
+        if not result[0]:
+            return
+        key = self.key(file_path, source_code)
+        payload = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO parse_cache (key, payload, last_used) VALUES (?, ?, ?)",
+                (key, payload, time.time()),
+            )
+            self._touched.pop(key, None)
+            self._flush_touched()
+            self._count += 1
+            if self._count > self.max_entries:
+                self._evict()
+            self._conn.commit()
+
+    def _flush_touched(self) -> None:
+        """Write the pending hit times (caller holds the lock and commits)."""
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE parse_cache SET last_used = ? WHERE key = ?",
+                [(last_used, key) for key, last_used in self._touched.items()],
+            )
+            self._touched.clear()
+
+    def _evict(self) -> None:
+        """Drop the least recently used rows if the cache exceeds `max_entries`.
+
+        Trims down to `EVICT_TO_FRACTION` of the limit; pending hit times must
+        have been flushed so recently read rows are kept.
+        """
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM parse_cache").fetchone()
+        if count > self.max_entries:
+            excess = count - int(self.max_entries * EVICT_TO_FRACTION)
+            self._conn.execute(
+                "DELETE FROM parse_cache WHERE rowid IN"
+                " (SELECT rowid FROM parse_cache ORDER BY last_used, rowid LIMIT ?)",
+                (excess,),
+            )
+            count -= excess
+        self._count = count
+
+
+_parse_cache: ParseCache | None = None
+_parse_cache_lock = threading.Lock()
+
+
+def get_parse_cache() -> ParseCache:
+    """Shared parse cache, opened on first use."""
+    global _parse_cache
+    if _parse_cache is None:
+        with _parse_cache_lock:
+            if _parse_cache is None:
+                _parse_cache = ParseCache()
+    return _parse_cache
@@ -1,52 +1,133 @@
-"""Python code parser implementation using `ast`.
+"""Python code parser implementation using Tree-sitter.
 
 Converts Python source files into CodeNode / CodeRelationship lists compatible
 with the rest of the indexing pipeline.
 """
 from __future__ import annotations
 
-import ast
+import sys
+import threading
+from collections import OrderedDict
 from typing import List, Tuple, Dict
 
-from .base import ICodeParser
+import tree_sitter_python as ts_python
+from tree_sitter import Language, Parser, Tree, Node
+
+from .base import ICodeParser, Scope, count_lines, edit_tree
 from ..models.graph_models import CodeNode, CodeRelationship, NodeType, RelationshipType
 
 
-class _PythonCodeGraphVisitor(ast.NodeVisitor):
-    """AST visitor that builds graph representation for Python code."""
+PY_LANGUAGE = Language(ts_python.language())
+
+# Files whose last tree is kept for incremental re-parsing
+TREE_CACHE_SIZE = 256
+
+# Compound statements and their clauses; definitions and imports only ever
+# appear inside these, so expressions are never walked
+_BLOCK_NODES = frozenset({
+    "block",
+    "decorated_definition",
+    "if_statement", "elif_clause", "else_clause",
+    "for_statement", "while_statement", "with_statement",
+    "try_statement", "except_clause", "except_group_clause", "finally_clause",
+    "match_statement", "case_clause",
+})
+
+# Parsers are not thread-safe; the watcher parses from a pool, so each thread
+# keeps its own (parsing itself releases the GIL)
+_local = threading.local()
+
+
+def _get_parser() -> Parser:
+    parser = getattr(_local, "parser", None)
+    if parser is None:
+        parser = _local.parser = Parser(PY_LANGUAGE)
+    return parser
+
+
+def _dotted_name(node: Node) -> str:
+    """`a.b.c` for a dotted_name, ignoring any whitespace between the parts."""
+    return ".".join(child.text.decode("utf-8") for child in node.named_children)
+
+
+def _end_line(node: Node) -> int:
+    """1-based line of the last code token in `node`.
+
+    Tree-sitter lets trailing comments extend a block; `ast` does not count
+    them, so they are skipped here to keep the same line ranges.
+    """
+    while node.child_count:
+        children = [child for child in node.children if child.type != "comment"]
+        if not children:
+            break
+        node = children[-1]
+    return node.end_point[0] + 1
+
+
+class _PythonCodeGraphVisitor:
+    """Tree-sitter visitor that builds graph representation for Python code."""
 
     def __init__(self, file_path: str, source_code: str):
-        self.file_path = file_path
-        self.source_code = source_code
-        self.nodes: Dict[str, CodeNode] = {}
+        # Shared by the FILE node and every relationship out of it
+        self.file_path = sys.intern(file_path)
+        # The source is only needed for the line count; not kept on the visitor
+        self.nodes: List[CodeNode] = []
+        # id -> position in `nodes`; ids repeat (re-imports, redefinitions)
+        # and the later node replaces the earlier one in place
+        self._index_by_id: Dict[str, int] = {}
         self.relationships: List[CodeRelationship] = []
-        self.scope_stack: List[str] = []
 
         # Root file node
         file_node_id = self.file_path
-        self.nodes[file_node_id] = CodeNode(
+        self._add_node(CodeNode(
             id=file_node_id,
             node_type=NodeType.FILE,
             name=file_path.split("/")[-1],
             start_line=1,
-            end_line=len(source_code.splitlines()),
-        )
-        self.scope_stack.append(file_node_id)
+            end_line=count_lines(source_code),
+        ))
+        # Enclosing scopes as a parent-pointer tree; `_cur` indexes the innermost
+        self._scopes: List[Scope] = [Scope(parent=-1, node_id=file_node_id, node_type=NodeType.FILE)]
+        self._cur = 0
+
+    def _add_node(self, node: CodeNode):
+        index = self._index_by_id.get(node.id)
+        if index is None:
+            self._index_by_id[node.id] = len(self.nodes)
+            self.nodes.append(node)
+        else:
+            self.nodes[index] = node
+
+    def _visit_scope(self, node: Node, node_id: str, node_type: NodeType):
+        """Visit the body of a class or function with it as the current scope."""
+        self._scopes.append(Scope(parent=self._cur, node_id=node_id, node_type=node_type))
+        self._cur = len(self._scopes) - 1
+        self.visit(node.child_by_field_name("body"))
+        self._cur = self._scopes[self._cur].parent
+
+    def visit(self, node: Node):
+        """Visit the definitions and imports nested in `node`'s statement blocks."""
+        handlers = self._HANDLERS
+        for child in node.named_children:
+            handler = handlers.get(child.type)
+            if handler is not None:
+                handler(self, child)
 
     # ------------------------------------------------------------------
-    # AST visitors
+    # Node visitors
     # ------------------------------------------------------------------
-    def visit_ClassDef(self, node: ast.ClassDef):  # type: ignore[override]
-        class_node_id = f"{self.file_path}:{node.name}"
-        parent_id = self.scope_stack[-1]
+    def _visit_class(self, node: Node):
+        name = node.child_by_field_name("name").text.decode("utf-8")
+        class_node_id = self.file_path + ":" + name
+        parent_id = self._scopes[self._cur].node_id
 
-        self.nodes[class_node_id] = CodeNode(
+        self._add_node(CodeNode(
             id=class_node_id,
             node_type=NodeType.CLASS,
-            name=node.name,
-            start_line=node.lineno,
-            end_line=getattr(node, "end_lineno", node.lineno),
-        )
+            name=name,
+            start_line=node.start_point[0] + 1,
+            end_line=_end_line(node),
+        ))
         self.relationships.append(
             CodeRelationship(
                 source_id=parent_id,
@@ -55,26 +136,24 @@ class _PythonCodeGraphVisitor(ast.NodeVisitor):
             )
         )
 
-        self.scope_stack.append(class_node_id)
-        self.generic_visit(node)
-        self.scope_stack.pop()
+        self._visit_scope(node, class_node_id, NodeType.CLASS)
 
-    def visit_FunctionDef(self, node: ast.FunctionDef):  # type: ignore[override]
-        parent_id = self.scope_stack[-1]
-        parent_node = self.nodes.get(parent_id)
-        is_method = parent_node and parent_node.node_type == NodeType.CLASS
+    def _visit_function(self, node: Node):
+        name = node.child_by_field_name("name").text.decode("utf-8")
+        parent = self._scopes[self._cur]
+        parent_id = parent.node_id
+        is_method = parent.node_type == NodeType.CLASS
         node_type = NodeType.METHOD if is_method else NodeType.FUNCTION
 
-        function_node_id = (
-            f"{parent_id}:{node.name}" if is_method else f"{self.file_path}:{node.name}"
-        )
-        self.nodes[function_node_id] = CodeNode(
+        # Two-part ids are concatenated; cheaper than formatting an f-string
+        function_node_id = (parent_id if is_method else self.file_path) + ":" + name
+        self._add_node(CodeNode(
             id=function_node_id,
             node_type=node_type,
-            name=node.name,
-            start_line=node.lineno,
-            end_line=getattr(node, "end_lineno", node.lineno),
-        )
+            name=name,
+            start_line=node.start_point[0] + 1,
+            end_line=_end_line(node),
+        ))
         self.relationships.append(
             CodeRelationship(
                 source_id=parent_id,
@@ -83,64 +162,122 @@ class _PythonCodeGraphVisitor(ast.NodeVisitor):
             )
         )
 
-        self.scope_stack.append(function_node_id)
-        self.generic_visit(node)
-        self.scope_stack.pop()
-
-    def visit_Import(self, node: ast.Import):  # type: ignore[override]
-        for alias in node.names:
-            import_node_id = f"import:{alias.name}"
-            self.nodes[import_node_id] = CodeNode(
-                id=import_node_id,
-                node_type=NodeType.IMPORT,
-                name=alias.name,
-                start_line=node.lineno,
-                end_line=node.lineno,
-            )
-            self.relationships.append(
-                CodeRelationship(
-                    source_id=self.file_path,
-                    target_id=import_node_id,
-                    type=RelationshipType.IMPORTS,
-                )
-            )
+        self._visit_scope(node, function_node_id, node_type)
 
-    def visit_ImportFrom(self, node: ast.ImportFrom):  # type: ignore[override]
-        module_name = node.module or "."
-        for alias in node.names:
-            import_node_id = f"import:{module_name}.{alias.name}"
-            self.nodes[import_node_id] = CodeNode(
-                id=import_node_id,
-                node_type=NodeType.IMPORT,
-                name=f"{module_name}.{alias.name}",
-                start_line=node.lineno,
-                end_line=node.lineno,
-            )
-            self.relationships.append(
-                CodeRelationship(
-                    source_id=self.file_path,
-                    target_id=import_node_id,
-                    type=RelationshipType.IMPORTS,
-                )
+    def _add_import(self, name: str, line: int):
+        # The same imports recur across most files of a repository
+        name = sys.intern(name)
+        import_node_id = sys.intern("import:" + name)
+        self._add_node(CodeNode(
+            id=import_node_id,
+            node_type=NodeType.IMPORT,
+            name=name,
+            start_line=line,
+            end_line=line,
+        ))
+        self.relationships.append(
+            CodeRelationship(
+                source_id=self.file_path,
+                target_id=import_node_id,
+                type=RelationshipType.IMPORTS,
             )
+        )
+
+    @staticmethod
+    def _imported_names(node: Node) -> List[str]:
+        names = []
+        append = names.append
+        for child in node.children_by_field_name("name"):
+            if child.type == "aliased_import":
+                child = child.child_by_field_name("name")
+            append(_dotted_name(child))
+        return names
+
+    def _visit_import(self, node: Node):
+        line = node.start_point[0] + 1
+        add_import = self._add_import
+        for name in self._imported_names(node):
+            add_import(name, line)
+
+    def _visit_import_from(self, node: Node):
+        if node.type == "future_import_statement":
+            module_name = "__future__"
+        else:
+            module = node.child_by_field_name("module_name")
+            if module.type == "relative_import":
+                # `from . import x` has no module; `from ..pkg import x` keeps `pkg`
+                module = next((c for c in module.named_children if c.type == "dotted_name"), None)
+            module_name = sys.intern(_dotted_name(module)) if module is not None else "."
+
+        names = self._imported_names(node)
+        if any(child.type == "wildcard_import" for child in node.named_children):
+            names.append("*")
+
+        line = node.start_point[0] + 1
+        add_import = self._add_import
+        prefix = module_name + "."
+        for name in names:
+            add_import(prefix + name, line)
+
+    # Statement type -> handler, one dict lookup per statement; anything else
+    # (expressions, assignments, ...) is skipped without being walked
+    _HANDLERS = {
+        "class_definition": _visit_class,
+        "function_definition": _visit_function,
+        "import_statement": _visit_import,
+        "import_from_statement": _visit_import_from,
+        "future_import_statement": _visit_import_from,
+        **dict.fromkeys(_BLOCK_NODES, visit),
+    }
 
 
 class PythonParser(ICodeParser):
-    """Parser plugin for Python source files."""
+    """Parser plugin for Python source files.
 
-    _SUPPORTED_EXTS = {".py"}
+    The previous tree of each file is re-used, so tree-sitter only re-parses
+    around an edit. Unchanged files never get here: results are cached per
+    content hash by `ParseCache`.
+    """
+
+    _SUPPORTED_EXTS = frozenset({".py"})
+
+    def __init__(self):
+        self._trees_lock = threading.Lock()
+        # file path -> (source bytes, tree) of the last parse, LRU-ordered
+        self._trees: OrderedDict[str, Tuple[bytes, Tree]] = OrderedDict()
 
     def supports_extension(self, ext: str) -> bool:  # noqa: D401
-        return ext.lower() in self._SUPPORTED_EXTS
+        return ext in self._SUPPORTED_EXTS or ext.lower() in self._SUPPORTED_EXTS
 
     def parse(
         self, file_path: str, source_code: str
     ) -> Tuple[List[CodeNode], List[CodeRelationship]]:
-        try:
-            tree = ast.parse(source_code)
-            visitor = _PythonCodeGraphVisitor(file_path, source_code)
-            visitor.visit(tree)
-            return list(visitor.nodes.values()), visitor.relationships
-        except SyntaxError as e:
-            print(f"PythonParser: syntax error in {file_path}: {e}")
+        source_bytes = source_code.encode("utf-8")
+        tree = self._parse_incremental(file_path, source_bytes)
+        if tree.root_node.has_error:
+            # Tree-sitter recovers from errors, but a partial graph would
+            # replace the file's last good one; keep the old all-or-nothing
+            print(f"PythonParser: syntax error in {file_path}")
             return [], []
+        visitor = _PythonCodeGraphVisitor(file_path, source_code)
+        visitor.visit(tree.root_node)
+        return visitor.nodes, visitor.relationships
+
+    def _parse_incremental(self, file_path: str, source_bytes: bytes) -> Tree:
+        """Parse `source_bytes`, re-using the file's previous tree if cached."""
+        # Taken out of the cache while in use: trees are edited in place, and
+        # parsing (with this thread's parser) runs outside the lock
+        with self._trees_lock:
+            cached = self._trees.pop(file_path, None)
+        if cached is None:
+            tree = _get_parser().parse(source_bytes)
+        else:
+            old_bytes, old_tree = cached
+            edit_tree(old_tree, old_bytes, source_bytes)
+            tree = _get_parser().parse(source_bytes, old_tree)
+
+        with self._trees_lock:
+            self._trees[file_path] = (source_bytes, tree)
+            if len(self._trees) > TREE_CACHE_SIZE:
+                self._trees.popitem(last=False)
+        return tree
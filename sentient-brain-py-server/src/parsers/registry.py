@@ -6,31 +6,72 @@ new languages later.
 """
 from __future__ import annotations
 
-from typing import List
+import os
+import threading
+from typing import Dict, List, Tuple, Type
 
 from .base import ICodeParser
+from ..models.graph_models import CodeNode, CodeRelationship
 from .python_parser import PythonParser
 from .typescript_parser import TypeScriptParser
 
 
 class ParserRegistry:
-    """Holds instantiated parser plugins and selects one by extension."""
+    """Holds parser plugins and selects one by extension.
+
+    Parsers are instantiated on first use, so e.g. the tree-sitter
+    grammars are only loaded once a file of their language shows up.
+    """
 
     def __init__(self) -> None:
-        self._parsers: List[ICodeParser] = [PythonParser(), TypeScriptParser()]
+        self._parser_classes: List[Type[ICodeParser]] = [PythonParser, TypeScriptParser]
+        # Extension -> parser class; the first registered class wins an extension
+        self._classes_by_ext: Dict[str, Type[ICodeParser]] = {}
+        for parser_class in self._parser_classes:
+            for ext in parser_class._SUPPORTED_EXTS:
+                self._classes_by_ext.setdefault(ext, parser_class)
+        self._supported_extensions = frozenset(self._classes_by_ext)
+        self._parsers: Dict[Type[ICodeParser], ICodeParser] = {}
+        self._lock = threading.Lock()
+
+    def _instance(self, parser_class: Type[ICodeParser]) -> ICodeParser:
+        parser = self._parsers.get(parser_class)
+        if parser is None:
+            with self._lock:
+                parser = self._parsers.get(parser_class)
+                if parser is None:
+                    parser = self._parsers[parser_class] = parser_class()
+        return parser
 
     def get_parser_for_ext(self, ext: str) -> ICodeParser | None:  # noqa: D401
-        for parser in self._parsers:
-            if parser.supports_extension(ext):
-                return parser
-        return None
+        # Extensions are almost always lower-case already; only lower on a miss
+        parser_class = self._classes_by_ext.get(ext) or self._classes_by_ext.get(ext.lower())
+        return self._instance(parser_class) if parser_class else None
+
+    def supported_extensions(self) -> frozenset[str]:
+        """All file extensions (e.g. ".py") handled by a registered parser."""
+        return self._supported_extensions
 
     # Convenience singleton
 
 _registry: ParserRegistry | None = None
+_registry_lock = threading.Lock()
 
 def get_parser_registry() -> ParserRegistry:  # noqa: D401
     global _registry
     if _registry is None:
-        _registry = ParserRegistry()
+        with _registry_lock:
+            if _registry is None:
+                _registry = ParserRegistry()
     return _registry
+
+
+def parse_file(file_path: str, source_code: str) -> Tuple[List[CodeNode], List[CodeRelationship]]:
+    """Parse one file with the parser registered for its extension.
+
+    Module-level (and therefore picklable) so it can run in a process pool.
+    """
+    parser = get_parser_registry().get_parser_for_ext(os.path.splitext(file_path)[1])
+    if not parser:
+        return [], []
+    return parser.parse(file_path, source_code)
@@ -5,64 +5,100 @@ lists compatible with the rest of the indexing pipeline.
 """
 from __future__ import annotations
 
+import sys
 import logging
-from typing import List, Tuple, Dict, Optional
+import functools
+import threading
+from collections import OrderedDict
+from typing import List, Tuple, Dict
 
 import tree_sitter_javascript as ts_javascript
 import tree_sitter_typescript as ts_typescript
-from tree_sitter import Language, Parser, Tree, Node
+from tree_sitter import Language, Parser, Query, Tree, Node
 
-from .base import ICodeParser
+from .base import ICodeParser, Scope, count_lines, edit_tree
 from ..models.graph_models import CodeNode, CodeRelationship, NodeType, RelationshipType
 
 logger = logging.getLogger(__name__)
 
+# Files whose last tree is kept for incremental re-parsing
+TREE_CACHE_SIZE = 256
+
+# Query capture name -> node types it matches
+_CAPTURE_NODE_TYPES = {
+    'function': ('function_declaration', 'function_expression', 'arrow_function'),
+    'method': ('method_definition', 'function_signature'),
+    'class': ('class_declaration',),
+    'import': ('import_statement', 'import_declaration'),
+}
+
+
+def _build_query(language: Language) -> Query:
+    """One query capturing every node the visitor handles.
+
+    Node types unknown to the grammar (e.g. `function_signature` in
+    JavaScript) would make the query invalid, so they are left out.
+    """
+    patterns = []
+    for capture, node_types in _CAPTURE_NODE_TYPES.items():
+        known = [t for t in node_types if language.id_for_node_kind(t, True) is not None]
+        if known:
+            patterns.append("[%s] @%s" % (" ".join(f"({t})" for t in known), capture))
+    return Query(language, "\n".join(patterns))
+
+
+# Language tables and compiled queries are immutable; build them once per
+# process however many parser instances are created
+@functools.lru_cache(maxsize=None)
+def _js_language() -> Language:
+    return Language(ts_javascript.language())
+
+
+@functools.lru_cache(maxsize=None)
+def _ts_language() -> Language:
+    return Language(ts_typescript.language_typescript())
+
+
+@functools.lru_cache(maxsize=None)
+def _compiled_query(language_name: str) -> Query:
+    return _build_query(_ts_language() if language_name == 'typescript' else _js_language())
+
 
 class _TypeScriptGraphVisitor:
     """Tree-sitter visitor that builds graph representation for TypeScript/JavaScript code."""
 
     def __init__(self, file_path: str, source_code: str, language: str):
-        self.file_path = file_path
-        self.source_code = source_code.encode('utf-8')
+        # Shared by the FILE node and every relationship out of it
+        self.file_path = sys.intern(file_path)
+        # Node text comes from the tree (`node.text`); the source is only
+        # needed here for the line count
         self.language = language
         self.nodes: Dict[str, CodeNode] = {}
         self.relationships: List[CodeRelationship] = []
-        self.scope_stack: List[str] = []
 
         # Root file node
         file_node_id = self.file_path
-        source_lines = source_code.splitlines()
         self.nodes[file_node_id] = CodeNode(
             id=file_node_id,
             node_type=NodeType.FILE,
             name=file_path.split("/")[-1],
             start_line=1,
-            end_line=len(source_lines),
+            end_line=count_lines(source_code),
         )
-        self.scope_stack.append(file_node_id)
+        # Enclosing scopes as a parent-pointer tree; `_cur` indexes the innermost
+        self._scopes: List[Scope] = [Scope(parent=-1, node_id=file_node_id, node_type=NodeType.FILE)]
+        self._cur = 0
 
-    def _get_text(self, node: Node) -> str:
+    @staticmethod
+    def _get_text(node: Node) -> str:
         """Extract text content from a tree-sitter node."""
-        return self.source_code[node.start_byte:node.end_byte].decode('utf-8')
+        return node.text.decode('utf-8')
 
-    def _get_identifier_name(self, node: Node) -> Optional[str]:
-        """Extract identifier name from various node types."""
-        if node.type == 'identifier':
-            return self._get_text(node)
-        
-        # Handle property_identifier
-        if node.type == 'property_identifier':
-            return self._get_text(node)
-            
-        # For function expressions and other complex nodes
-        for child in node.children:
-            if child.type == 'identifier':
-                return self._get_text(child)
-                
-        return None
+    def _process_function_node(self, node: Node, is_method: bool = False) -> Scope:
+        """Process function declaration, function expression, method definition, etc.
 
-    def _process_function_node(self, node: Node, is_method: bool = False) -> None:
-        """Process function declaration, function expression, method definition, etc."""
+        Returns the scope for the function's children.
+        """
         # Try to get function name
         func_name = None
         for child in node.children:
@@ -74,16 +110,14 @@ class _TypeScriptGraphVisitor:
             # Anonymous function or arrow function
             func_name = f"anonymous_{node.start_point[0]}"
 
-        parent_id = self.scope_stack[-1]
-        parent_node = self.nodes.get(parent_id)
+        parent = self._scopes[self._cur]
+        parent_id = parent.node_id
         
         # Determine if this is a method based on context
-        actual_is_method = is_method or (parent_node and parent_node.node_type == NodeType.CLASS)
+        actual_is_method = is_method or parent.node_type == NodeType.CLASS
         node_type = NodeType.METHOD if actual_is_method else NodeType.FUNCTION
 
-        function_node_id = (
-            f"{parent_id}:{func_name}" if actual_is_method else f"{self.file_path}:{func_name}"
-        )
+        function_node_id = (parent_id if actual_is_method else self.file_path) + ":" + func_name
         
         self.nodes[function_node_id] = CodeNode(
             id=function_node_id,
@@ -101,12 +135,13 @@ class _TypeScriptGraphVisitor:
             )
         )
 
-        self.scope_stack.append(function_node_id)
-        self._visit_children(node)
-        self.scope_stack.pop()
+        return Scope(parent=self._cur, node_id=function_node_id, node_type=node_type, end_byte=node.end_byte)
+
+    def _process_method_node(self, node: Node) -> Scope:
+        return self._process_function_node(node, is_method=True)
 
-    def _process_class_node(self, node: Node) -> None:
-        """Process class declaration."""
+    def _process_class_node(self, node: Node) -> Scope:
+        """Process class declaration; returns the scope for its members."""
         class_name = None
         for child in node.children:
             if child.type == 'identifier':
@@ -116,8 +151,8 @@ class _TypeScriptGraphVisitor:
         if not class_name:
             class_name = f"anonymous_class_{node.start_point[0]}"
 
-        class_node_id = f"{self.file_path}:{class_name}"
-        parent_id = self.scope_stack[-1]
+        class_node_id = self.file_path + ":" + class_name
+        parent_id = self._scopes[self._cur].node_id
 
         self.nodes[class_node_id] = CodeNode(
             id=class_node_id,
@@ -135,14 +170,10 @@ class _TypeScriptGraphVisitor:
             )
         )
 
-        self.scope_stack.append(class_node_id)
-        self._visit_children(node)
-        self.scope_stack.pop()
+        return Scope(parent=self._cur, node_id=class_node_id, node_type=NodeType.CLASS, end_byte=node.end_byte)
 
     def _process_import_node(self, node: Node) -> None:
-        """Process import statements."""
-        import_text = self._get_text(node)
-        
+        """Process import statements (their children are not visited)."""
         # Extract module name from different import patterns
         module_name = "unknown"
         
@@ -153,7 +184,9 @@ class _TypeScriptGraphVisitor:
                 module_name = self._get_text(child).strip('"').strip("'")
                 break
 
-        import_node_id = f"import:{module_name}"
+        # The same modules are imported across most files of a repository
+        module_name = sys.intern(module_name)
+        import_node_id = sys.intern("import:" + module_name)
         
         self.nodes[import_node_id] = CodeNode(
             id=import_node_id,
@@ -171,79 +204,99 @@ class _TypeScriptGraphVisitor:
             )
         )
 
-    def _visit_children(self, node: Node) -> None:
-        """Recursively visit all children of a node."""
-        for child in node.children:
-            self._visit_node(child)
+    # Capture name -> handler; handlers returning a Scope open it for the
+    # node's subtree, those returning None (imports) are not looked into
+    _HANDLERS = {
+        'function': _process_function_node,
+        'method': _process_method_node,
+        'class': _process_class_node,
+        'import': _process_import_node,
+    }
 
-    def _visit_node(self, node: Node) -> None:
-        """Visit a single node and process it based on its type."""
-        
-        # Function-related nodes
-        if node.type in ['function_declaration', 'function_expression', 'arrow_function']:
-            self._process_function_node(node)
-            
-        # Method definitions in classes
-        elif node.type in ['method_definition', 'function_signature']:
-            self._process_function_node(node, is_method=True)
-            
-        # Class declarations
-        elif node.type == 'class_declaration':
-            self._process_class_node(node)
-            
-        # Import statements
-        elif node.type in ['import_statement', 'import_declaration']:
-            self._process_import_node(node)
-            
-        else:
-            # Continue visiting children for other node types
-            self._visit_children(node)
+    def visit(self, captures: Dict[str, List[Node]]) -> None:
+        """Build the graph from the query captures of one tree.
 
-    def visit(self, tree: Tree) -> None:
-        """Start visiting from the root node."""
-        self._visit_node(tree.root_node)
+        Captures are handled in document order (outer before inner at the
+        same start); a scope stays open until a capture starts at or after
+        its node's end byte.
+        """
+        found = sorted(
+            ((node, self._HANDLERS[name]) for name, nodes in captures.items() for node in nodes),
+            key=lambda item: (item[0].start_byte, -item[0].end_byte),
+        )
+        scopes = self._scopes
+        push = scopes.append
+        skip_until = -1
+        for node, handler in found:
+            start = node.start_byte
+            if start < skip_until:
+                continue  # inside an import
+            while self._cur and start >= scopes[self._cur].end_byte:
+                self._cur = scopes[self._cur].parent
+            scope = handler(self, node)
+            if scope is None:
+                skip_until = node.end_byte
+            else:
+                push(scope)
+                self._cur = len(scopes) - 1
 
 
 class TypeScriptParser(ICodeParser):
     """Parser plugin for TypeScript and JavaScript source files."""
 
-    _SUPPORTED_EXTS = {".ts", ".tsx", ".js", ".jsx", ".mjs", ".cjs"}
+    _SUPPORTED_EXTS = frozenset({".ts", ".tsx", ".js", ".jsx", ".mjs", ".cjs"})
+    _TS_EXTS = frozenset({"ts", "tsx"})
     
     def __init__(self):
-        # Initialize languages
-        self.js_language = Language(ts_javascript.language())
-        self.ts_language = Language(ts_typescript.language_typescript())
+        # Shared, process-wide languages
+        self.js_language = _js_language()
+        self.ts_language = _ts_language()
         
-        # Create parsers
+        # Create parsers (cheap, but stateful: one per instance, used under `_lock`)
         self.js_parser = Parser(self.js_language)
         self.ts_parser = Parser(self.ts_language)
 
+        # Compiled once per process; matching runs in C and yields only the nodes we handle
+        self.js_query = _compiled_query('javascript')
+        self.ts_query = _compiled_query('typescript')
+
+        # file path -> (source bytes, tree) of the last parse, LRU-ordered.
+        # Parsers are not thread-safe and the watcher parses from a pool.
+        self._trees: OrderedDict[str, Tuple[bytes, Tree]] = OrderedDict()
+        self._lock = threading.Lock()
+
     def supports_extension(self, ext: str) -> bool:
         """Return True if this parser can handle the given file extension."""
-        return ext.lower() in self._SUPPORTED_EXTS
+        return ext in self._SUPPORTED_EXTS or ext.lower() in self._SUPPORTED_EXTS
 
-    def _get_parser_and_language(self, file_path: str) -> Tuple[Parser, str]:
-        """Get the appropriate parser and language name based on file extension."""
-        ext = file_path.lower().split('.')[-1]
-        if ext in ['ts', 'tsx']:
-            return self.ts_parser, 'typescript'
+    def _get_parser_and_language(self, file_path: str) -> Tuple[Parser, Query, str]:
+        """Get the appropriate parser, query and language name based on file extension."""
+        # Only the extension is lowered, and only when it is not lower-case already
+        ext = file_path.rpartition('.')[2]
+        if not ext.islower():
+            ext = ext.lower()
+        if ext in self._TS_EXTS:
+            return self.ts_parser, self.ts_query, 'typescript'
         else:
-            return self.js_parser, 'javascript'
+            return self.js_parser, self.js_query, 'javascript'
 
     def parse(
         self, file_path: str, source_code: str
     ) -> Tuple[List[CodeNode], List[CodeRelationship]]:
         """Parse TypeScript/JavaScript source code into graph nodes and relationships."""
         try:
-            parser, language = self._get_parser_and_language(file_path)
+            parser, query, language = self._get_parser_and_language(file_path)
             
-            # Parse the source code
+            # Parse the source code, reusing the previous tree when we have one
             source_bytes = source_code.encode('utf-8')
-            tree = parser.parse(source_bytes)
+            tree = self._parse_incremental(parser, file_path, source_bytes)
+            with self._lock:
+                # Queries keep their match state internally, like parsers
+                captures = query.captures(tree.root_node)
             
             # Build the graph
             visitor = _TypeScriptGraphVisitor(file_path, source_code, language)
-            visitor.visit(tree)
+            visitor.visit(captures)
             
             logger.info(f"TypeScript/JS parser processed {file_path}: "
                        f"{len(visitor.nodes)} nodes, {len(visitor.relationships)} relationships")
@@ -252,4 +305,23 @@ class TypeScriptParser(ICodeParser):
             
         except Exception as e:
             logger.error(f"TypeScriptParser: error parsing {file_path}: {e}")
-            return [], [] 
\ No newline at end of file
+            return [], [] 
+
+    def _parse_incremental(self, parser: Parser, file_path: str, source_bytes: bytes) -> Tree:
+        """Parse `source_bytes`, re-using the file's previous tree if cached."""
+        with self._lock:
+            cached = self._trees.pop(file_path, None)
+            if cached is None:
+                tree = parser.parse(source_bytes)
+            else:
+                old_bytes, old_tree = cached
+                if old_bytes == source_bytes:
+                    tree = old_tree
+                else:
+                    edit_tree(old_tree, old_bytes, source_bytes)
+                    tree = parser.parse(source_bytes, old_tree)
+
+            self._trees[file_path] = (source_bytes, tree)
+            if len(self._trees) > TREE_CACHE_SIZE:
+                self._trees.popitem(last=False)
+            return tree
@@ -1,178 +1,102 @@
 import os
-import ast
 import uuid
-from typing import List, Tuple, Dict, Any
+import hashlib
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple, Dict, Any, Iterator, Set
 
-from ..models.graph_models import CodeNode, CodeRelationship, NodeType, RelationshipType
-from ..db.neo4j_driver import get_neo4j_session
+from weaviate.classes.data import DataObject
+
+from ..models.graph_models import CodeNode, CodeRelationship, NodeType
+from ..db.neo4j_driver import get_neo4j_session, Neo4jBatcher, CODE_NODE_LABEL
 from ..db.weaviate_client import get_weaviate_client
 from ..embedding.embedder import get_embedder
-from ..parsers.registry import get_parser_registry
+from ..parsers.registry import get_parser_registry, parse_file
+from ..parsers.cache import get_parse_cache, ParseResult
 from .metadata_extractor import get_metadata_extractor
 
-class CodeGraphVisitor(ast.NodeVisitor):
-    """An AST visitor that builds a graph of nodes and relationships."""
-
-    MIN_BLOCK_LINES = 5  # Minimum lines for a block to be considered significant
-
-    def __init__(self, file_path: str, source_code: str):
-        self.file_path = file_path
-        self.source_code = source_code
-        self.nodes: Dict[str, CodeNode] = {}
-        self.relationships: List[CodeRelationship] = []
-        self.scope_stack: List[str] = []
-
-        # Create the root FILE node
-        file_node_id = self.file_path
-        self.nodes[file_node_id] = CodeNode(
-            id=file_node_id,
-            node_type=NodeType.FILE,
-            name=self.file_path.split('/')[-1],
-            start_line=1,
-            end_line=len(self.source_code.splitlines()),
-        )
-        self.scope_stack.append(file_node_id)
-        self.block_counter = 0
-
-    def visit_ClassDef(self, node: ast.ClassDef):
-        class_node_id = f"{self.file_path}:{node.name}"
-        parent_id = self.scope_stack[-1]
-
-        self.nodes[class_node_id] = CodeNode(
-            id=class_node_id,
-            node_type=NodeType.CLASS,
-            name=node.name,
-            start_line=node.lineno,
-            end_line=node.end_lineno if hasattr(node, 'end_lineno') else node.lineno,
-        )
-        self.relationships.append(
-            CodeRelationship(
-                source_id=parent_id,
-                target_id=class_node_id,
-                type=RelationshipType.CONTAINS,
-            )
-        )
-        
-        self.scope_stack.append(class_node_id)
-        self.generic_visit(node)
-        self.scope_stack.pop()
-
-    def _is_significant_block(self, node) -> bool:
-        start_line = node.lineno
-        end_line = getattr(node, 'end_lineno', start_line)
-        return (end_line - start_line + 1) >= self.MIN_BLOCK_LINES
-
-    def _create_block_node(self, node, block_type: str):
-        if not self._is_significant_block(node):
-            self.generic_visit(node) # Still need to visit children
-            return
-
-        parent_id = self.scope_stack[-1]
-        self.block_counter += 1
-        block_node_id = f"{parent_id}:block_{self.block_counter}_{block_type}_{node.lineno}"
-
-        self.nodes[block_node_id] = CodeNode(
-            id=block_node_id,
-            node_type=NodeType.BLOCK,
-            name=f"{block_type.capitalize()} Block",
-            start_line=node.lineno,
-            end_line=getattr(node, 'end_lineno', node.lineno),
-        )
-        self.relationships.append(
-            CodeRelationship(
-                source_id=parent_id,
-                target_id=block_node_id,
-                type=RelationshipType.CONTAINS,
-            )
-        )
-        # We don't push block to scope_stack, but we visit children from here
-        self.scope_stack.append(block_node_id)
-        self.generic_visit(node)
-        self.scope_stack.pop()
-
-    def visit_If(self, node: ast.If):
-        self._create_block_node(node, 'if')
-
-    def visit_For(self, node: ast.For):
-        self._create_block_node(node, 'for_loop')
-
-    def visit_While(self, node: ast.While):
-        self._create_block_node(node, 'while_loop')
-
-    def visit_FunctionDef(self, node: ast.FunctionDef):
-        parent_id = self.scope_stack[-1]
-        parent_node = self.nodes.get(parent_id)
-
-        is_method = parent_node and parent_node.node_type == NodeType.CLASS
-        node_type = NodeType.METHOD if is_method else NodeType.FUNCTION
-        
-        function_node_id = f"{parent_id}:{node.name}" if is_method else f"{self.file_path}:{node.name}"
-
-        self.nodes[function_node_id] = CodeNode(
-            id=function_node_id,
-            node_type=node_type,
-            name=node.name,
-            start_line=node.lineno,
-            end_line=node.end_lineno if hasattr(node, 'end_lineno') else node.lineno,
-        )
-        self.relationships.append(
-            CodeRelationship(
-                source_id=parent_id,
-                target_id=function_node_id,
-                type=RelationshipType.CONTAINS,
-            )
-        )
-        
-        self.scope_stack.append(function_node_id)
-        self.generic_visit(node)
-        self.scope_stack.pop()
-
-    def visit_Import(self, node: ast.Import):
-        for alias in node.names:
-            import_node_id = f"import:{alias.name}"
-            self.nodes[import_node_id] = CodeNode(
-                id=import_node_id,
-                node_type=NodeType.IMPORT,
-                name=alias.name,
-                start_line=node.lineno,
-                end_line=node.lineno,
-            )
-            self.relationships.append(
-                CodeRelationship(
-                    source_id=self.file_path,
-                    target_id=import_node_id,
-                    type=RelationshipType.IMPORTS,
+# Batches with at least this many files are parsed in a process pool; parsing
+# is CPU-bound and holds the GIL, but smaller batches are not worth the IPC
+PARALLEL_PARSE_MIN_FILES = int(os.getenv("PARALLEL_PARSE_MIN_FILES", "8"))
+
+_CQL_LINK_COMMIT = """
+    MERGE (c:Commit {hash: $hash})
+    ON CREATE SET c.author = $author, c.timestamp = timestamp()
+    WITH c
+    UNWIND $file_ids AS file_id
+    MATCH (f:File {id: file_id})
+    MERGE (c)-[:MODIFIED]->(f)
+"""
+
+# Missing chunks embedded and inserted per call during back-population
+BACKPOP_BATCH_SIZE = 1000
+
+_parser_pool: ProcessPoolExecutor | None = None
+_parser_pool_lock = threading.Lock()
+
+
+def _line_starts(source_code: str) -> List[int]:
+    """Offset of the start of each line, plus an end sentinel.
+
+    Line `i` (0-based, without its newline) is
+    `source_code[starts[i]:starts[i + 1] - 1]`; lines are split on "\n" only,
+    as the parsers count them.
+    """
+    starts = [0]
+    find = source_code.find
+    index = find("\n")
+    while index != -1:
+        starts.append(index + 1)
+        index = find("\n", index + 1)
+    if not source_code.endswith("\n"):
+        starts.append(len(source_code) + 1)
+    return starts
+
+
+def _line_range(source_code: str, starts: List[int], start_line: int, end_line: int) -> str:
+    """Lines `start_line..end_line` (1-based, inclusive, clamped to the file) as one slice."""
+    start = max(0, start_line - 1)
+    end = min(len(starts) - 1, end_line)
+    if start >= end:
+        return ""
+    text = source_code[starts[start]:starts[end] - 1]
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").removesuffix("\r")
+    return text
+
+
+def get_parser_pool() -> ProcessPoolExecutor:
+    """Process pool used to parse large batches, created on first use."""
+    global _parser_pool
+    if _parser_pool is None:
+        with _parser_pool_lock:
+            if _parser_pool is None:
+                # Spawned, not forked: the server process runs driver and watcher threads
+                _parser_pool = ProcessPoolExecutor(
+                    max_workers=os.cpu_count(),
+                    mp_context=multiprocessing.get_context("spawn"),
                 )
-            )
-        self.generic_visit(node)
-
-    def visit_ImportFrom(self, node: ast.ImportFrom):
-        module_name = node.module or "."
-        for alias in node.names:
-            import_node_id = f"import:{module_name}.{alias.name}"
-            self.nodes[import_node_id] = CodeNode(
-                id=import_node_id,
-                node_type=NodeType.IMPORT,
-                name=f"{module_name}.{alias.name}",
-                start_line=node.lineno,
-                end_line=node.lineno,
-            )
-            self.relationships.append(
-                CodeRelationship(
-                    source_id=self.file_path,
-                    target_id=import_node_id,
-                    type=RelationshipType.IMPORTS,
-                )
-            )
-        self.generic_visit(node)
+    return _parser_pool
+
+
+def shutdown_parser_pool():
+    global _parser_pool
+    if _parser_pool is not None:
+        _parser_pool.shutdown(wait=True, cancel_futures=True)
+        _parser_pool = None
+
 
 class CodeGraphService:
     """Service to parse source code, build a knowledge graph, and sync to Weaviate."""
 
     def __init__(self):
         self.weaviate_client = get_weaviate_client()
-        self.embedder = get_embedder()
+        get_embedder()  # choose the provider at startup; batches look it up again
         self.metadata_extractor = get_metadata_extractor()
+        self.parse_cache = get_parse_cache()
+        # path -> sha256 of the content last written to Neo4j/Weaviate by this service
+        self._indexed_digests: Dict[str, bytes] = {}
         print("CodeGraphService initialized with Weaviate, Embedder, and MetadataExtractor.")
 
     def parse_code_to_graph(
@@ -189,131 +113,208 @@ class CodeGraphService:
 
     def persist_graph(self, nodes: List[CodeNode], relationships: List[CodeRelationship], file_metadata: Dict[str, Any]):
         """Persists the graph nodes and relationships to Neo4j."""
+        batcher = Neo4jBatcher()
+        self._add_graph(batcher, nodes, relationships, file_metadata)
         with get_neo4j_session() as session:
-            for node in nodes:
-                # Neo4j does not allow nested maps as property values, so exclude metadata
-                base_props = node.model_dump(exclude={"id", "node_type", "metadata"})
-
-                # Find the FILE node and add the extracted metadata
-                if node.node_type == NodeType.FILE:
-                    base_props.update(file_metadata)
-
-                session.run(
-                    """MERGE (n {id: $id})
-                       SET n += $props, n.node_type = $node_type""",
-                    id=node.id,
-                    props=base_props,
-                    node_type=node.node_type.value,
-                )
-            for rel in relationships:
-                if rel.metadata:
-                    props_clause = "SET r += $props"
-                else:
-                    props_clause = ""
-                cypher = (
-                    """MATCH (a {id: $source_id}), (b {id: $target_id})
-                       MERGE (a)-[r:%s {type: $type}]->(b)
-                       %s""" % (rel.type.value, props_clause)
-                )
-                session.run(
-                    cypher,
-                    source_id=rel.source_id,
-                    target_id=rel.target_id,
-                    type=rel.type.value,
-                    props=rel.metadata if rel.metadata else {},
-                )
+            session.execute_write(batcher.flush)
         print(f"Persisted {len(nodes)} nodes and {len(relationships)} relationships.")
 
+    def _add_graph(
+        self,
+        batcher: Neo4jBatcher,
+        nodes: List[CodeNode],
+        relationships: List[CodeRelationship],
+        file_metadata: Dict[str, Any],
+        imports_seen: Set[str] | None = None,
+    ):
+        """Queue one file's graph on `batcher`.
+
+        Import nodes are keyed by module only, so most files of a batch share
+        them; with `imports_seen` each is queued once per batch (the IMPORTS
+        relationships are still queued for every file).
+        """
+        for node in nodes:
+            if imports_seen is not None and node.node_type == NodeType.IMPORT:
+                if node.id in imports_seen:
+                    continue
+                imports_seen.add(node.id)
+            base_props = node.props()
+
+            # Find the FILE node and add the extracted metadata
+            if node.node_type == NodeType.FILE:
+                base_props.update(file_metadata)
+
+            batcher.add_node(node.id, node.node_type.value, base_props)
+        for rel in relationships:
+            batcher.add_rel(rel.type.value, rel.source_id, rel.target_id, rel.metadata)
+
     def sync_code_chunks_to_weaviate(self, file_path: str, source_code: str, nodes: List[CodeNode]):
         """Extracts code content, generates embeddings, and upserts to Weaviate."""
-        code_chunk_collection = self.weaviate_client.collections.get("CodeChunk")
-        source_lines = source_code.splitlines()
-
-        nodes_to_embed = [
-            n for n in nodes 
-            if n.node_type in [NodeType.CLASS, NodeType.FUNCTION, NodeType.METHOD, NodeType.BLOCK]
-        ]
-
-        if not nodes_to_embed:
-            return
-
-        # Prepare content for batch embedding
-        contents_to_embed = []
-        for node in nodes_to_embed:
-            # Ensure start and end lines are within bounds
-            start = max(0, node.start_line - 1)
-            end = min(len(source_lines), node.end_line)
-            content = "\n".join(source_lines[start:end])
-            contents_to_embed.append(content)
-
-        # Get embeddings
-        vectors = self.embedder.embed(contents_to_embed)
-
-        # Insert each code chunk individually with proper UUID format
-        for i, node in enumerate(nodes_to_embed):
-            # Generate a proper UUID4 for Weaviate
-            chunk_uuid = str(uuid.uuid4())
-            
-            data_object = {
+        chunks = self._code_chunks(file_path, source_code, nodes)
+        if chunks:
+            self._insert_code_chunks(chunks)
+            print(f"Synced {len(chunks)} code chunks to Weaviate for file {file_path}.")
+
+    def _code_chunks(self, file_path: str, source_code: str, nodes: List[CodeNode]) -> List[Dict[str, Any]]:
+        """CodeChunk properties for the class/function/method/block nodes of one file."""
+        # Each chunk is one slice of the source rather than a join of its lines
+        starts = _line_starts(source_code)
+        chunks = []
+        for node in nodes:
+            if node.node_type not in (NodeType.CLASS, NodeType.FUNCTION, NodeType.METHOD, NodeType.BLOCK):
+                continue
+            chunks.append({
                 "source_id": node.id,  # Store original Neo4j ID for linking
                 "file_path": file_path,
                 "node_type": node.node_type.value,
                 "name": node.name,
                 "start_line": node.start_line,
                 "end_line": node.end_line,
-                "content": contents_to_embed[i],
-            }
-            
-            try:
-                code_chunk_collection.data.insert(
-                    properties=data_object,
-                    vector=vectors[i],
-                    uuid=chunk_uuid  # Use proper UUID format
-                )
-                print(f"[WEAVIATE] Inserted chunk {node.name} with UUID: {chunk_uuid}", flush=True)
-            except Exception as e:
-                print(f"[WEAVIATE] Error inserting chunk {node.name}: {e}", flush=True)
-        
-        print(f"Synced {len(nodes_to_embed)} code chunks to Weaviate for file {file_path}.")
-
-    def process_file(self, file_path: str, source_code: str, commit_hash: str = None, commit_author: str = None):
-        """Parses a file, enriches with metadata, persists graph, and syncs chunks."""
-        # 1. Extract metadata first
-        metadata = self.metadata_extractor.extract_metadata(file_path)
-        print(f"Extracted metadata for {file_path}: {metadata}", flush=True)
-
-        # 2. Parse code into structural graph
-        nodes, relationships = self.parse_code_to_graph(file_path, source_code)
-        if not nodes and not relationships:
-            return
-
-        # 3. Persist to Neo4j and Weaviate, now with metadata
-        self.persist_graph(nodes, relationships, metadata)
-        self.sync_code_chunks_to_weaviate(file_path, source_code, nodes)
-
-        # 4. If commit info is present, link the file to the commit
-        if commit_hash:
-            self.link_file_to_commit(file_path, commit_hash, commit_author)
-
-        # Summary log
-        class_count = sum(1 for n in nodes if n.node_type == NodeType.CLASS)
-        func_count = sum(1 for n in nodes if n.node_type in [NodeType.FUNCTION, NodeType.METHOD])
-        print(f"Indexed {class_count} classes, {func_count} functions from {file_path} with domain '{metadata['domain']}'.")
+                "content": _line_range(source_code, starts, node.start_line, node.end_line),
+            })
+        return chunks
+
+    def _insert_code_chunks(self, chunks: List[Dict[str, Any]]) -> Set[int]:
+        """Embeds the chunks in one call and writes them with a single insert_many.
+
+        Returns the indices of the chunks that were not written.
+        """
+        # Resolved per batch so a switch back from the fallback provider applies
+        vectors = get_embedder().embed([chunk["content"] for chunk in chunks])
+        objects = [
+            # Generate a proper UUID4 for Weaviate
+            DataObject(properties=chunk, vector=vector, uuid=str(uuid.uuid4()))
+            for chunk, vector in zip(chunks, vectors)
+        ]
+        code_chunk_collection = self.weaviate_client.collections.get("CodeChunk")
+        try:
+            result = code_chunk_collection.data.insert_many(objects)
+        except Exception as e:
+            print(f"[WEAVIATE] Error inserting {len(objects)} chunks: {e}", flush=True)
+            return set(range(len(chunks)))
+        for index, error in result.errors.items():
+            print(f"[WEAVIATE] Error inserting chunk {chunks[index]['name']}: {error.message}", flush=True)
+        print(f"[WEAVIATE] Inserted {len(objects) - len(result.errors)} chunks", flush=True)
+        return set(result.errors)
+
+    def process_file(self, file_path: str, source_code: str | bytes, commit_hash: str = None, commit_author: str = None):
+        """Parses a file, enriches with metadata, persists graph, and syncs chunks.
+
+        `source_code` may be raw bytes (e.g. from the CLI's mmap read); it is
+        decoded once here.
+        """
+        self.process_files([(file_path, source_code)], commit_hash, commit_author)
+
+    def process_files(self, files: List[Tuple[str, str | bytes]], commit_hash: str = None, commit_author: str = None):
+        """`process_file` for several `(file_path, source_code)` pairs at once.
+
+        Batches of `PARALLEL_PARSE_MIN_FILES` or more are parsed across a
+        process pool; the whole batch is written with one Neo4j session, one
+        embedding call and one Weaviate `insert_many`.
+        """
+        batcher = Neo4jBatcher()
+        chunks: List[Dict[str, Any]] = []
+        indexed_paths = []
+        imports_seen: Set[str] = set()
+        files = [
+            (file_path, source_code.decode("utf-8") if isinstance(source_code, bytes) else source_code)
+            for file_path, source_code in files
+        ]
+
+        # Content this service already indexed (a save without changes, a
+        # re-run hook) is not parsed, written or embedded again
+        digests = {file_path: hashlib.sha256(source_code.encode("utf-8")).digest() for file_path, source_code in files}
+        unchanged = [file_path for file_path, _ in files if self._indexed_digests.get(file_path) == digests[file_path]]
+        if unchanged:
+            print(f"Skipping {len(unchanged)} file(s) unchanged since last indexed.", flush=True)
+            skip = set(unchanged)
+            files = [file for file in files if file[0] not in skip]
+
+        # 1. Parse code into structural graphs; each file is queued as soon as
+        # its graph is ready, while the pool keeps parsing the rest
+        for file_path, source_code, (nodes, relationships) in self._parsed_files(files):
+            if not nodes and not relationships:
+                continue
+
+            # 2. Extract metadata
+            metadata = self.metadata_extractor.extract_metadata(file_path)
+            print(f"Extracted metadata for {file_path}: {metadata}", flush=True)
+
+            # 3. Queue for Neo4j and Weaviate, now with metadata
+            self._add_graph(batcher, nodes, relationships, metadata, imports_seen)
+            chunks.extend(self._code_chunks(file_path, source_code, nodes))
+            indexed_paths.append(file_path)
+
+            # Summary log
+            class_count = sum(1 for n in nodes if n.node_type == NodeType.CLASS)
+            func_count = sum(1 for n in nodes if n.node_type in [NodeType.FUNCTION, NodeType.METHOD])
+            print(f"Indexed {class_count} classes, {func_count} functions from {file_path} with domain '{metadata['domain']}'.")
+
+        # 4. If commit info is present, the files are linked to the commit in
+        # the same transaction as the graph write
+        linked_paths = indexed_paths + unchanged if commit_hash else []
+        if indexed_paths or linked_paths:
+            node_count, rel_count = batcher.node_count, batcher.relationship_count
+            with get_neo4j_session() as session:
+                session.execute_write(self._write_batch, batcher, linked_paths, commit_hash, commit_author)
+            if indexed_paths:
+                print(f"Persisted {node_count} nodes and {rel_count} relationships.")
+            for file_path in linked_paths:
+                print(f"Linked {file_path} to commit {commit_hash}", flush=True)
+
+        failed_paths = set()
+        if chunks:
+            failed = self._insert_code_chunks(chunks)
+            failed_paths = {chunks[index]["file_path"] for index in failed}
+            print(f"Synced {len(chunks) - len(failed)} code chunks to Weaviate for {len(indexed_paths)} file(s).")
+        # Files with a failed chunk are not recorded, so their next save retries
+        self._indexed_digests.update(
+            (file_path, digests[file_path]) for file_path in indexed_paths if file_path not in failed_paths
+        )
+
+    @staticmethod
+    def _write_batch(tx, batcher: Neo4jBatcher, linked_paths: List[str], commit_hash: str | None, commit_author: str | None):
+        """Transaction function: the batch's graph, then its commit links."""
+        batcher.flush(tx)
+        if linked_paths:
+            tx.run(_CQL_LINK_COMMIT, hash=commit_hash, author=commit_author, file_ids=linked_paths).consume()
+
+    def _parsed_files(self, files: List[Tuple[str, str]]) -> Iterator[Tuple[str, str, ParseResult]]:
+        """Yield `(file_path, source_code, (nodes, relationships))` in order.
+
+        Unchanged files come from the parse cache; the rest are parsed in the
+        process pool for large batches. Pool results are yielded as they
+        arrive rather than collected first, so callers handle one file's graph
+        while later files are still being parsed.
+        """
+        parsed = [self.parse_cache.get(file_path, source_code) for file_path, source_code in files]
+        misses = [files[i] for i, result in enumerate(parsed) if result is None]
+        if len(misses) >= PARALLEL_PARSE_MIN_FILES:
+            paths, sources = zip(*misses)
+            fresh = get_parser_pool().map(parse_file, paths, sources, chunksize=4)
+        else:
+            fresh = (self.parse_code_to_graph(*file) for file in misses)
+        for (file_path, source_code), result in zip(files, parsed):
+            if result is None:
+                result = next(fresh)
+                self.parse_cache.put(file_path, source_code, result)
+            yield file_path, source_code, result
 
     def link_file_to_commit(self, file_path: str, commit_hash: str, commit_author: str = None):
         """Create a :Commit node and link it to the modified :File node."""
+        self.link_files_to_commit([file_path], commit_hash, commit_author)
+
+    def link_files_to_commit(self, file_paths: List[str], commit_hash: str, commit_author: str = None):
+        """Create a :Commit node and link it to each modified :File node."""
         with get_neo4j_session() as session:
             session.run(
-                """MERGE (c:Commit {hash: $hash})
-                   ON CREATE SET c.author = $author, c.timestamp = timestamp()
-                   WITH c
-                   MATCH (f:File {id: $file_id})
-                   MERGE (c)-[:MODIFIED]->(f)""",
+                _CQL_LINK_COMMIT,
                 hash=commit_hash,
                 author=commit_author,
-                file_id=file_path
-            )
-            print(f"Linked {file_path} to commit {commit_hash}", flush=True)
+                file_ids=file_paths,
+            ).consume()
+            for file_path in file_paths:
+                print(f"Linked {file_path} to commit {commit_hash}", flush=True)
 
     # ---------------------
     # Back-population util
@@ -325,20 +326,24 @@ class CodeGraphService:
         client = get_weaviate_client()
         chunk_coll = client.collections.get("CodeChunk")
 
-        # 1. Fetch all existing source_ids from Weaviate
+        # 1. Collect all existing source_ids from Weaviate; the cursor pages
+        # through the collection fetching only that property, so neither the
+        # other properties nor the whole collection are held at once
         existing_source_ids: set[str] = set()
         try:
-            objs = chunk_coll.query.fetch_objects(limit=100000)  # all
-            for ob in objs.objects:  # type: ignore
-                existing_source_ids.add(ob.properties.get("source_id"))
+            existing_source_ids.update(
+                ob.properties.get("source_id")
+                for ob in chunk_coll.iterator(return_properties=["source_id"])
+            )
         except Exception as exc:
             print(f"[BACKPOP] Error fetching existing chunks: {exc}", flush=True)
 
-        # 2. Query Neo4j for candidate nodes
+        # 2. Query Neo4j for candidate nodes; the label keeps the scan to code
+        # nodes instead of every node in the database
         with get_neo4j_session() as session:
             records = session.run(
-                """
-                MATCH (n)
+                f"""
+                MATCH (n:{CODE_NODE_LABEL})
                 WHERE n.node_type IN ['CLASS','FUNCTION','METHOD']
                 RETURN n.id   AS id,
                        n.name AS name,
@@ -348,38 +353,41 @@ class CodeGraphService:
                        n.file_path  AS file_path
                 """
             )
-            missing = []
-            for rec in records:
-                sid = rec["id"]
-                if sid not in existing_source_ids:
-                    missing.append(rec)
+            missing = [rec for rec in records if rec["id"] not in existing_source_ids]
 
-            print(f"[BACKPOP] {len(missing)} missing chunks to backfill.", flush=True)
+        print(f"[BACKPOP] {len(missing)} missing chunks to backfill.", flush=True)
 
-            for rec in missing:
-                file_path = rec["file_path"]
+        # Read each source file once, however many of its chunks are missing
+        sources: Dict[str, Tuple[str, List[int]] | None] = {}
+        chunks = []
+        for rec in missing:
+            sid = rec["id"]
+            file_path = rec["file_path"]
+            if file_path not in sources:
                 try:
                     with open(file_path, "r", encoding="utf-8") as f:
-                        lines = f.read().splitlines()
-                    start = max(0, (rec["start_line"] or 1)-1)
-                    end = min(len(lines), rec["end_line"] or start+1)
-                    content = "\n".join(lines[start:end])
-                    vector = self.embedder.embed([content])[0]
-                    chunk_uuid = str(uuid.uuid4())
-                    chunk_coll.data.insert(
-                        properties={
-                            "source_id": sid,
-                            "file_path": file_path,
-                            "node_type": rec["node_type"],
-                            "name": rec["name"],
-                            "start_line": rec["start_line"],
-                            "end_line": rec["end_line"],
-                            "content": content,
-                        },
-                        vector=vector,
-                        uuid=chunk_uuid,
-                    )
-                    print(f"[BACKPOP] Inserted missing chunk {sid} → {chunk_uuid}", flush=True)
+                        source_code = f.read()
+                    sources[file_path] = (source_code, _line_starts(source_code))
                 except Exception as exc:
-                    print(f"[BACKPOP] Failed to backfill {sid}: {exc}", flush=True)
+                    print(f"[BACKPOP] Failed to read {file_path}: {exc}", flush=True)
+                    sources[file_path] = None
+            source = sources[file_path]
+            if source is None:
+                print(f"[BACKPOP] Failed to backfill {sid}: source unavailable", flush=True)
+                continue
+            start_line = rec["start_line"] or 1
+            end_line = rec["end_line"] or start_line
+            chunks.append({
+                "source_id": sid,
+                "file_path": file_path,
+                "node_type": rec["node_type"],
+                "name": rec["name"],
+                "start_line": rec["start_line"],
+                "end_line": rec["end_line"],
+                "content": _line_range(*source, start_line, end_line),
+            })
+
+        # One embedding call and one insert_many per slice of chunks
+        for start in range(0, len(chunks), BACKPOP_BATCH_SIZE):
+            self._insert_code_chunks(chunks[start:start + BACKPOP_BATCH_SIZE])
         print("[BACKPOP] Completed.", flush=True)
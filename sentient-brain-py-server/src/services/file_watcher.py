@@ -9,10 +9,12 @@ import threading
 import os
 import time
 import fnmatch
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-from watchdog.events import FileSystemEventHandler
-from watchdog.observers.polling import PollingObserver
+from watchdog.events import PatternMatchingEventHandler
+from watchdog.observers import Observer
+from watchdog.observers.polling import PollingObserverVFS
 
 from .code_graph_service import CodeGraphService
 from ..parsers.registry import get_parser_registry
@@ -48,14 +50,73 @@ DEFAULT_IGNORE_PATTERNS = [
     "ollama_data",
 ]
 
+# Quiet period per path before a change is processed; editors and `git checkout`
+# emit bursts of events for one save, which collapse into a single re-index
+DEBOUNCE_SECONDS = 0.25
 
-class CodeChangeHandler(FileSystemEventHandler):
-    """Handles file system events for Python source files."""
+# Upper bound on files processed at once; caps concurrent Neo4j sessions and
+# embedding/Weaviate calls during bursts
+MAX_PROCESSING_WORKERS = min(8, os.cpu_count() or 1)
 
-    def __init__(self, code_graph_service: CodeGraphService, ignore_patterns: list[str] | None = None):
+# Files due at the same time (e.g. after a `git checkout`) are processed
+# together, with one Neo4j/Weaviate write per batch of at most this many
+MAX_BATCH_FILES = 64
+
+
+def _in_container() -> bool:
+    """Whether this process runs in a Docker container (watched paths are then bind mounts)."""
+    return os.path.exists("/.dockerenv")
+
+
+class CodeChangeHandler(PatternMatchingEventHandler):
+    """Handles file system events for source files with a registered parser.
+
+    Extension and file-name filtering happens in watchdog's dispatcher via
+    `patterns`/`ignore_patterns`, so events for assets, logs and directories
+    never reach the handler methods.
+    """
+
+    def __init__(
+        self,
+        code_graph_service: CodeGraphService,
+        ignore_patterns: list[str] | None = None,
+        debounce_seconds: float = DEBOUNCE_SECONDS,
+        max_workers: int = MAX_PROCESSING_WORKERS,
+    ):
         self.code_graph_service = code_graph_service
-        self.ignore_patterns = ignore_patterns or DEFAULT_IGNORE_PATTERNS
-        print(f"Initialized CodeChangeHandler with ignore patterns: {self.ignore_patterns}")
+        self.path_ignore_patterns = ignore_patterns or DEFAULT_IGNORE_PATTERNS
+        super().__init__(
+            patterns=[f"*{ext}" for ext in sorted(get_parser_registry().supported_extensions())],
+            # Name-level patterns only; directory patterns ("node_modules") must
+            # match any path component and are checked in `_should_ignore_path`
+            ignore_patterns=[pattern for pattern in self.path_ignore_patterns if pattern.startswith("*.")],
+            ignore_directories=True,
+            case_sensitive=False,
+        )
+        self.debounce_seconds = debounce_seconds
+        # One long-lived dispatcher hands paths that have been quiet for
+        # `debounce_seconds` to a bounded pool, so watchdog callbacks never
+        # block on file I/O or graph updates and no thread is spawned per event.
+        # A path is never processed by two workers at once.
+        self._pending: dict[str, float] = {}  # path -> monotonic due time
+        self._in_flight: set[str] = set()
+        # path -> (mtime_ns, size) when it was last indexed; events that leave
+        # both unchanged (attribute changes, repeated polling hits) are dropped
+        self._indexed_stat: dict[str, tuple[int, int]] = {}
+        self._cond = threading.Condition()
+        self._stopping = False
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="watcher-graph")
+        self._worker = threading.Thread(target=self._worker_loop, name="watcher-worker", daemon=True)
+        self._worker.start()
+        print(f"Initialized CodeChangeHandler with ignore patterns: {self.path_ignore_patterns}")
+
+    def shutdown(self):
+        """Stop the dispatcher after it flushes pending paths, then drain the pool."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        self._worker.join()
+        self._executor.shutdown(wait=True)
 
     def _should_ignore_path(self, path: str) -> bool:
         """Check if a path should be ignored based on ignore patterns."""
@@ -63,148 +124,181 @@ class CodeChangeHandler(FileSystemEventHandler):
         
         # Check each part of the path against ignore patterns
         for part in path_obj.parts:
-            for pattern in self.ignore_patterns:
+            for pattern in self.path_ignore_patterns:
                 if fnmatch.fnmatch(part, pattern):
                     return True
         
         # Also check the full relative path against patterns
-        for pattern in self.ignore_patterns:
+        for pattern in self.path_ignore_patterns:
             if fnmatch.fnmatch(str(path_obj), pattern):
                 return True
                 
         return False
 
-    def on_any_event(self, event):
-        """Log ALL events for debugging purposes."""
-        event_type = event.event_type
-        src_path = event.src_path
-        is_directory = event.is_directory
-        
-        if self._should_ignore_path(src_path):
-            return  # Don't even log ignored paths to reduce noise
-        
-        print(f"[FILE_WATCHER] Event detected: {event_type} | Path: {src_path} | Is Dir: {is_directory}", flush=True)
-        
-        # Also log the file extension if it's a file
-        if not is_directory:
-            ext = Path(src_path).suffix
-            print(f"[FILE_WATCHER] File extension: {ext}", flush=True)
-
     def on_modified(self, event):
         print(f"[FILE_WATCHER] on_modified triggered: {event.src_path}", flush=True)
-        if event.is_directory:
-            print(f"[FILE_WATCHER] Skipping directory: {event.src_path}", flush=True)
-            return
-            
         if self._should_ignore_path(event.src_path):
             print(f"[FILE_WATCHER] Ignoring path: {event.src_path}", flush=True)
             return
-        
-        ext = Path(event.src_path).suffix
-        parser = get_parser_registry().get_parser_for_ext(ext)
-        
-        if parser:
-            print(f"[FILE_WATCHER] Parser found for {ext}: Processing {event.src_path}", flush=True)
-            self._process_file(event.src_path)
-        else:
-            print(f"[FILE_WATCHER] No parser for extension {ext}, skipping {event.src_path}", flush=True)
+        self._process_file(event.src_path)
 
     def on_created(self, event):
         print(f"[FILE_WATCHER] on_created triggered: {event.src_path}", flush=True)
-        if event.is_directory:
-            print(f"[FILE_WATCHER] Skipping directory creation: {event.src_path}", flush=True)
-            return
-            
         if self._should_ignore_path(event.src_path):
             print(f"[FILE_WATCHER] Ignoring path: {event.src_path}", flush=True)
             return
-        
-        ext = Path(event.src_path).suffix
-        parser = get_parser_registry().get_parser_for_ext(ext)
-        
-        if parser:
-            print(f"[FILE_WATCHER] Parser found for {ext}: Processing new file {event.src_path}", flush=True)
-            self._process_file(event.src_path)
-        else:
-            print(f"[FILE_WATCHER] No parser for extension {ext}, skipping new file {event.src_path}", flush=True)
+        self._process_file(event.src_path)
 
     def on_moved(self, event):
         print(f"[FILE_WATCHER] on_moved triggered: {event.src_path} -> {event.dest_path}", flush=True)
-        # Handle moved files as a delete + create
-        if not event.is_directory:
-            if self._should_ignore_path(event.dest_path):
-                print(f"[FILE_WATCHER] Ignoring moved file destination: {event.dest_path}", flush=True)
-                return
-                
-            ext = Path(event.dest_path).suffix
-            if get_parser_registry().get_parser_for_ext(ext):
-                print(f"[FILE_WATCHER] Processing moved file: {event.dest_path}", flush=True)
-                self._process_file(event.dest_path)
+        # Handle moved files as a delete + create; the event matched on either
+        # path, so the destination still needs its own checks
+        if self._should_ignore_path(event.dest_path):
+            print(f"[FILE_WATCHER] Ignoring moved file destination: {event.dest_path}", flush=True)
+            return
+
+        ext = Path(event.dest_path).suffix
+        if get_parser_registry().get_parser_for_ext(ext):
+            print(f"[FILE_WATCHER] Processing moved file: {event.dest_path}", flush=True)
+            self._process_file(event.dest_path)
 
     def on_deleted(self, event):
         print(f"[FILE_WATCHER] on_deleted triggered: {event.src_path}", flush=True)
         # For deletions, we might want to remove from Neo4j/Weaviate in the future
         # For now, just log it
-        if not event.is_directory:
-            if self._should_ignore_path(event.src_path):
-                return  # Don't log ignored deletions
-                
-            ext = Path(event.src_path).suffix
-            if get_parser_registry().get_parser_for_ext(ext):
-                print(f"[FILE_WATCHER] Code file deleted: {event.src_path} (cleanup not implemented yet)", flush=True)
+        if self._should_ignore_path(event.src_path):
+            return  # Don't log ignored deletions
+        print(f"[FILE_WATCHER] Code file deleted: {event.src_path} (cleanup not implemented yet)", flush=True)
 
     def _process_file(self, file_path: str):
-        """Reads a file and triggers the graph processing service."""
+        """Schedules a file for processing, restarting its debounce window."""
+        with self._cond:
+            self._pending[file_path] = time.monotonic() + self.debounce_seconds
+            self._cond.notify()
+        print(f"[FILE_WATCHER] Queued for processing: {file_path}", flush=True)
+
+    def _next_due_batch(self) -> list[str] | None:
+        """Blocks until pending paths are due and idle; returns None once stopped and drained.
+
+        Every path that is already due is returned (up to `MAX_BATCH_FILES`),
+        so a burst of changes becomes a few batches rather than one task per file.
+        """
+        with self._cond:
+            while True:
+                if self._stopping and not self._pending:
+                    return None
+                ready = [item for item in self._pending.items() if item[0] not in self._in_flight]
+                if not ready:
+                    # Nothing pending, or only paths still being processed
+                    self._cond.wait()
+                    continue
+                now = time.monotonic()
+                due = sorted(
+                    (item for item in ready if item[1] <= now or self._stopping),
+                    key=lambda item: item[1],
+                )[:MAX_BATCH_FILES]
+                if due:
+                    batch = [file_path for file_path, _ in due]
+                    for file_path in batch:
+                        del self._pending[file_path]
+                        self._in_flight.add(file_path)
+                    return batch
+                self._cond.wait(min(item[1] for item in ready) - now)
+
+    def _worker_loop(self):
+        """Dispatches debounced batches of files to the processing pool until shutdown."""
+        while (batch := self._next_due_batch()) is not None:
+            self._executor.submit(self._process_and_release, batch)
+
+    def _process_and_release(self, batch: list[str]):
         try:
-            print(f"[FILE_WATCHER] Reading file: {file_path}", flush=True)
-            
-            # Check if file exists (might have been deleted between event and processing)
-            if not os.path.exists(file_path):
-                print(f"[FILE_WATCHER] File no longer exists: {file_path}", flush=True)
-                return
-                
-            with open(file_path, "r", encoding="utf-8") as f:
-                source_code = f.read()
-
-            print(f"[FILE_WATCHER] File read successfully, content length: {len(source_code)} chars", flush=True)
-
-            # Offload heavy processing to a background thread (watchdog callbacks are sync)
-            thread = threading.Thread(
-                target=self._process_file_background,
-                args=(file_path, source_code),
-                daemon=True,
-            )
-            thread.start()
-            print(f"[FILE_WATCHER] Background processing thread started for: {file_path}", flush=True)
-            
-        except Exception as e:
-            print(f"[FILE_WATCHER] Error processing file {file_path}: {e}", flush=True)
+            self._process_batch_background(batch)
+        finally:
+            with self._cond:
+                self._in_flight.difference_update(batch)
+                self._cond.notify()
+
+    def _process_batch_background(self, batch: list[str]):
+        """Reads the files and triggers the graph processing service (worker thread)."""
+        files = []
+        stats = {}
+        for file_path in batch:
+            try:
+                print(f"[FILE_WATCHER] Reading file: {file_path}", flush=True)
+
+                # Check if file exists (might have been deleted between event and processing)
+                try:
+                    st = os.stat(file_path)
+                except FileNotFoundError:
+                    print(f"[FILE_WATCHER] File no longer exists: {file_path}", flush=True)
+                    continue
+                stat_key = (st.st_mtime_ns, st.st_size)
+                if self._indexed_stat.get(file_path) == stat_key:
+                    print(f"[FILE_WATCHER] Unchanged since last indexed: {file_path}", flush=True)
+                    continue
+
+                with open(file_path, "r", encoding="utf-8") as f:
+                    source_code = f.read()
+
+                print(f"[FILE_WATCHER] File read successfully, content length: {len(source_code)} chars", flush=True)
+                files.append((file_path, source_code))
+                stats[file_path] = stat_key
+            except Exception as e:
+                print(f"[FILE_WATCHER] Error reading {file_path}: {e}", flush=True)
 
-    def _process_file_background(self, file_path: str, source_code: str):
-        """Background thread processing to avoid blocking the file watcher."""
+        if not files:
+            return
         try:
-            print(f"[FILE_WATCHER] Background processing started for: {file_path}", flush=True)
-            self.code_graph_service.process_file(file_path, source_code)
-            print(f"[FILE_WATCHER] Background processing completed for: {file_path}", flush=True)
+            print(f"[FILE_WATCHER] Background processing started for {len(files)} file(s)", flush=True)
+            self.code_graph_service.process_files(files)
+            # A path is only processed by one worker at a time, so no lock is needed
+            self._indexed_stat.update(stats)
+            print(f"[FILE_WATCHER] Background processing completed for {len(files)} file(s)", flush=True)
         except Exception as e:
-            print(f"[FILE_WATCHER] Error in background processing for {file_path}: {e}", flush=True)
+            print(f"[FILE_WATCHER] Error in background processing for {[path for path, _ in files]}: {e}", flush=True)
 
 
 class FileWatcherService:
-    """Manages the file system observer with aggressive polling for Docker environments."""
+    """Manages the file system observer.
+
+    Inside a container the observer polls, because inotify events do not
+    cross Docker bind mounts; on the host the native observer
+    (inotify/FSEvents) is used, which costs nothing while files are idle.
+    `WATCHER_USE_POLLING=true|false` overrides the detection.
+    """
 
     def __init__(self, paths_to_watch: list[str], code_graph_service: CodeGraphService, ignore_patterns: list[str] | None = None):
-        # Use more aggressive polling for Docker environments
-        self.observer = PollingObserver(timeout=0.5)  # Poll every 500ms instead of default 1s
         self.paths_to_watch = paths_to_watch
         self.code_graph_service = code_graph_service
         self.ignore_patterns = ignore_patterns or DEFAULT_IGNORE_PATTERNS
-        print(f"[FILE_WATCHER] Initialized with aggressive polling (500ms interval)", flush=True)
+        use_polling = os.getenv("WATCHER_USE_POLLING")
+        if use_polling is None:
+            self.use_polling = _in_container()
+        else:
+            self.use_polling = use_polling.lower() not in ("0", "false", "no")
+        if self.use_polling:
+            # Use more aggressive polling for Docker environments; ignored
+            # directories are pruned from every snapshot walk
+            self.observer = PollingObserverVFS(stat=os.stat, listdir=self._listdir, polling_interval=0.5)
+        else:
+            self.observer = Observer(timeout=0.5)
+        self.event_handler: CodeChangeHandler | None = None
+        mode = "aggressive polling (500ms interval)" if self.use_polling else "native observer"
+        print(f"[FILE_WATCHER] Initialized with {mode}", flush=True)
         print(f"[FILE_WATCHER] Using ignore patterns: {self.ignore_patterns}", flush=True)
 
+    def _listdir(self, path: str):
+        """`os.scandir` for the polling snapshot, skipping ignored entries."""
+        with os.scandir(path) as entries:
+            return [
+                entry for entry in entries
+                if not any(fnmatch.fnmatch(entry.name, pattern) for pattern in self.ignore_patterns)
+            ]
+
     def start(self):
         """Starts the file watcher in a background thread."""
         event_handler = CodeChangeHandler(self.code_graph_service, self.ignore_patterns)
+        self.event_handler = event_handler
         
         for path in self.paths_to_watch:
             # Convert to absolute path for better reliability
@@ -234,4 +328,6 @@ class FileWatcherService:
         print("[FILE_WATCHER] Stopping file watcher...", flush=True)
         self.observer.stop()
         self.observer.join()
+        if self.event_handler:
+            self.event_handler.shutdown()
         print("[FILE_WATCHER] File watcher stopped.", flush=True)
@@ -262,6 +262,14 @@ class GroqAgenticService:
             )
 
 # Factory function for easy access
+_groq_service: GroqAgenticService | None = None
+
 def get_groq_service() -> GroqAgenticService:
-    """Get a configured Groq agentic service instance."""
-    return GroqAgenticService() 
\ No newline at end of file
+    """Get the shared Groq agentic service (one HTTP client per process).
+
+    A failed construction (e.g. missing API key) is not cached.
+    """
+    global _groq_service
+    if _groq_service is None:
+        _groq_service = GroqAgenticService()
+    return _groq_service
@@ -1,18 +1,22 @@
 import weaviate
 import weaviate.classes.config as wvc
 from weaviate.collections.classes.config import Configure
+from weaviate.classes.data import DataObject
 from uuid import uuid4
 
 from ..db.weaviate_client import get_weaviate_client
 from ..models.document_models import DocumentSource, DocumentChunk, DocumentType, IngestionStatus
 from ..embedding.embedder import get_embedder
 
+# CodeChunk vectors Weaviate collects before training the PQ codebook
+CODE_CHUNK_PQ_TRAINING_LIMIT = 10000
+
 class IngestionService:
     """Service for ingesting and processing documents into Weaviate."""
 
     def __init__(self):
         self.client = get_weaviate_client()
-        self.embedder = get_embedder()
+        get_embedder()  # choose the provider at startup; batches look it up again
 
     def initialize_schema(self, recreate: bool = False):
         """Ensures the required collections exist in Weaviate."""
@@ -52,9 +56,21 @@ class IngestionService:
             self.client.collections.create(
                 name=code_chunk_collection_name,
                 vectorizer_config=Configure.Vectorizer.none(),
+                # Product quantization: vectors are inserted as fp32 and
+                # Weaviate compresses them in the HNSW index once
+                # `training_limit` objects exist, cutting index memory ~4x+
+                vector_index_config=Configure.VectorIndex.hnsw(
+                    quantizer=Configure.VectorIndex.Quantizer.pq(training_limit=CODE_CHUNK_PQ_TRAINING_LIMIT),
+                ),
                 properties=[
                     wvc.Property(name="source_id", data_type=wvc.DataType.TEXT),  # Original Neo4j node ID
-                    wvc.Property(name="file_path", data_type=wvc.DataType.TEXT),
+                    # Whole-value tokens so `/context` can filter on the exact path
+                    wvc.Property(
+                        name="file_path",
+                        data_type=wvc.DataType.TEXT,
+                        tokenization=wvc.Tokenization.FIELD,
+                        index_filterable=True,
+                    ),
                     wvc.Property(name="node_type", data_type=wvc.DataType.TEXT),
                     wvc.Property(name="name", data_type=wvc.DataType.TEXT),
                     wvc.Property(name="start_line", data_type=wvc.DataType.INT),
@@ -97,21 +113,25 @@ class IngestionService:
         chunk_collection = self.client.collections.get("DocumentChunk")
         
         # Generate embeddings for all chunks
-        vectors = self.embedder.embed(chunks)
-        embedding_provider_name = self.embedder.__class__.__name__
+        embedder = get_embedder()
+        vectors = embedder.embed(chunks)
+        # Name the provider, not the cache wrapping it
+        embedding_provider_name = type(getattr(embedder, "embedder", embedder)).__name__
 
-        # Insert each chunk individually (v4 client no longer supports .batch() on DataCollection)
-        for i, chunk_content in enumerate(chunks):
-            data_object = {
-                "content": chunk_content,
-                "order": i,
-                "embedding_provider": embedding_provider_name,
-            }
-            chunk_collection.data.insert(
-                properties=data_object,
+        objects = [
+            DataObject(
+                properties={
+                    "content": chunk_content,
+                    "order": i,
+                    "embedding_provider": embedding_provider_name,
+                },
                 vector=vectors[i],
-                references={
-                    "from_source": [source_uuid]
-                }
+                references={"from_source": source_uuid},
             )
+            for i, chunk_content in enumerate(chunks)
+        ]
+        # One batch request for all chunks instead of a round-trip per chunk
+        result = chunk_collection.data.insert_many(objects)
+        if result.has_errors:
+            raise RuntimeError(f"Failed to ingest {len(result.errors)} of {len(chunks)} chunks: {list(result.errors.values())[0].message}")
         print(f"Successfully ingested {len(chunks)} chunks for source {source_uuid}.")
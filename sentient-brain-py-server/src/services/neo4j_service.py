@@ -1,10 +1,3 @@
-from neo4j import GraphDatabase, Driver
-import os
-from dotenv import load_dotenv
-
-# Load environment variables from .env file
-load_dotenv()
-
 """
 Neo4j Graph Data Model for Codebase AST (Abstract Syntax Tree)
 
@@ -27,39 +20,13 @@ RELATIONSHIP TYPES:
 - (:File)-[:IMPORTS]->(:Import)
 - (:Function)-[:CALLS]->(:Function)
 - (:Class)-[:INHERITS_FROM]->(:Class)
-"""
-
-# Global driver instance
-_driver = None
 
-def get_neo4j_driver() -> Driver:
-    """
-    Establishes a connection to the Neo4j AuraDB and returns a driver object.
-    Uses a singleton pattern to reuse the existing driver if already connected.
-    """
-    global _driver
-    if _driver is None:
-        uri = os.getenv("NEO4J_URI")
-        user = os.getenv("NEO4J_USERNAME")
-        password = os.getenv("NEO4J_PASSWORD")
-
-        if not all([uri, user, password]):
-            raise ValueError("Neo4j connection details not found in environment variables. Please check your .env file.")
-
-        print("Connecting to Neo4j AuraDB...")
-        _driver = GraphDatabase.driver(uri, auth=(user, password))
-        print("Successfully connected to Neo4j.")
-    return _driver
+The driver itself lives in `src/db/neo4j_driver.py`; these names are
+re-exported so every import path shares the same pooled driver.
+"""
+from ..db.neo4j_driver import get_neo4j_driver, close_neo4j_driver
 
-def close_neo4j_driver():
-    """
-    Closes the Neo4j driver connection if it exists.
-    """
-    global _driver
-    if _driver is not None:
-        _driver.close()
-        _driver = None
-        print("Neo4j connection closed.")
+__all__ = ["get_neo4j_driver", "close_neo4j_driver"]
 
 # Example usage (for testing purposes)
 if __name__ == "__main__":
@@ -8,7 +8,7 @@ This service provides:
 4. Collection statistics and health checks
 5. Data export capabilities
 """
-import json
+import orjson
 from typing import List, Dict, Any, Optional, Union
 from dataclasses import dataclass
 from ..db.weaviate_client import get_weaviate_client
@@ -308,7 +308,7 @@ class WeaviateInspector:
                 return {
                     "status": "success",
                     "export_data": export_data,
-                    "json_string": json.dumps(export_data, indent=2)
+                    "json_string": orjson.dumps(export_data, option=orjson.OPT_INDENT_2).decode("utf-8")
                 }
             else:
                 return details
@@ -321,6 +321,11 @@ class WeaviateInspector:
             }
 
 # Factory function
+_inspector: WeaviateInspector | None = None
+
 def get_weaviate_inspector() -> WeaviateInspector:
-    """Get a configured Weaviate inspector instance."""
-    return WeaviateInspector() 
\ No newline at end of file
+    """Get the shared Weaviate inspector instance."""
+    global _inspector
+    if _inspector is None:
+        _inspector = WeaviateInspector()
+    return _inspector 
\ No newline at end of file
@@ -1,44 +1,8 @@
 import weaviate
-import os
-from dotenv import load_dotenv
-from weaviate.auth import AuthApiKey
 
-# Load environment variables from .env file
-load_dotenv()
-
-def get_weaviate_client():
-    """
-    Connects to a Weaviate instance and returns a client object.
-
-    The connection logic prioritizes Weaviate Cloud Services (WCS).
-    If WCS credentials are not found, it falls back to a local connection.
-    """
-    wcs_cluster_url = os.getenv("WCS_CLUSTER_URL")
-    wcs_api_key = os.getenv("WCS_API_KEY")
-    
-    weaviate_host = os.getenv("WEAVIATE_HOST")
-    weaviate_port = os.getenv("WEAVIATE_PORT")
-
-    if wcs_cluster_url and wcs_api_key:
-        # Connect to Weaviate Cloud Service
-        print("Connecting to Weaviate Cloud Service...")
-        client = weaviate.connect_to_wcs(
-            cluster_url=wcs_cluster_url,
-            auth_credentials=AuthApiKey(api_key=wcs_api_key),
-        )
-        print("Successfully connected to WCS.")
-        return client
-    elif weaviate_host and weaviate_port:
-        # Connect to a local Weaviate instance
-        print(f"Connecting to local Weaviate instance at {weaviate_host}:{weaviate_port}...")
-        client = weaviate.connect_to_local(
-            host=weaviate_host,
-            port=int(weaviate_port)
-        )
-        print("Successfully connected to local Weaviate.")
-        return client
-    else:
-        raise ValueError("Weaviate connection details not found in environment variables. Please check your .env file.")
+# The shared, readiness-checked client; re-exported so every import path
+# uses the same connection instead of opening its own.
+from ..db.weaviate_client import get_weaviate_client, close_weaviate_client
 
 from weaviate.classes.config import Configure, Property, DataType
 
@@ -80,5 +44,5 @@ if __name__ == "__main__":
         print(f"An error occurred: {e}")
     finally:
         if client:
-            client.close()
+            close_weaviate_client()
             print("Weaviate connection closed.")
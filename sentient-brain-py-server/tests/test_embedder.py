@@ -0,0 +1,45 @@
+"""get_embedder tests: fallback re-checks and cache reuse across switches."""
+
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.embedding import embedder as embedder_module  # noqa: E402
+
+
+class FakeProvider:
+    def __init__(self, model_name):
+        self.model_name = model_name
+
+    def embed(self, texts):
+        return [[1.0] for _ in texts]
+
+
+def test_switches_back_from_fallback_and_reuses_caches(tmp_path, monkeypatch):
+    monkeypatch.setenv("EMBEDDING_CACHE_PATH", str(tmp_path / "emb.sqlite3"))
+    monkeypatch.setattr(embedder_module, "_provider", None)
+    monkeypatch.setattr(embedder_module, "_embedder", None)
+    monkeypatch.setattr(embedder_module, "_recheck_at", None)
+    monkeypatch.setattr(embedder_module, "_caches", {})
+    monkeypatch.setattr(embedder_module, "EMBEDDER_HEALTH_INTERVAL", 0)
+
+    fallback = FakeProvider("local")
+    # A new remote provider instance is built on every probe
+    choices = iter([(fallback, True), (FakeProvider("remote"), False), (fallback, True), (FakeProvider("remote"), True)])
+    monkeypatch.setattr(embedder_module, "_create_embedder", lambda: next(choices))
+
+    local = embedder_module.get_embedder()
+    assert local.embedder is fallback
+
+    remote = embedder_module.get_embedder()  # re-checked after the interval
+    assert remote.model_name == "remote"
+    # Healthy again: no further probes
+    assert embedder_module.get_embedder() is remote
+
+    embedder_module._recheck_at = 0
+    assert embedder_module.get_embedder() is local
+    # A switch to a model seen before reuses its cache (and connection)
+    embedder_module._recheck_at = 0
+    assert embedder_module.get_embedder() is remote
+    assert len(embedder_module._caches) == 2
@@ -0,0 +1,75 @@
+"""CachedEmbedder tests: hits, misses, input order, empty vectors and eviction."""
+
+import itertools
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.embedding import cache as embedding_cache  # noqa: E402
+from src.embedding.cache import CachedEmbedder  # noqa: E402
+
+
+class FakeEmbedder:
+    model_name = "fake"
+
+    def __init__(self):
+        self.calls = []
+
+    def embed(self, texts):
+        self.calls.append(list(texts))
+        # "fail" mimics a provider error for that text
+        return [[] if text == "fail" else [float(len(text))] for text in texts]
+
+
+def test_embeds_only_misses_in_input_order(tmp_path):
+    fake = FakeEmbedder()
+    cache = CachedEmbedder(fake, path=str(tmp_path / "emb.sqlite3"))
+
+    assert cache.embed(["a", "bb"]) == [[1.0], [2.0]]
+    assert cache.embed(["ccc", "a", "ccc", "bb"]) == [[3.0], [1.0], [3.0], [2.0]]
+    # Hits are not re-embedded and duplicates within one call are embedded once
+    assert fake.calls == [["a", "bb"], ["ccc"]]
+
+
+def test_empty_vectors_not_cached(tmp_path):
+    fake = FakeEmbedder()
+    cache = CachedEmbedder(fake, path=str(tmp_path / "emb.sqlite3"))
+
+    assert cache.embed(["fail", "ok"]) == [[], [2.0]]
+    assert cache.embed(["fail", "ok"]) == [[], [2.0]]
+    assert fake.calls == [["fail", "ok"], ["fail"]]
+
+
+def test_keys_include_model_name(tmp_path):
+    path = str(tmp_path / "emb.sqlite3")
+    CachedEmbedder(FakeEmbedder(), path=path).embed(["a"])
+
+    other = FakeEmbedder()
+    other.model_name = "other"
+    CachedEmbedder(other, path=path).embed(["a"])
+    assert other.calls == [["a"]]
+
+
+def test_evicts_least_recently_used(tmp_path, monkeypatch):
+    clock = itertools.count(1)
+    monkeypatch.setattr(embedding_cache.time, "time", lambda: float(next(clock)))
+    fake = FakeEmbedder()
+    cache = CachedEmbedder(fake, path=str(tmp_path / "emb.sqlite3"), max_entries=3)
+    for text in ("a", "b", "c"):
+        cache.embed([text])
+    cache.embed(["a"])  # "b" and "c" are now the oldest
+    cache.embed(["d"])
+    fake.calls.clear()
+
+    cache.embed(["a", "b", "c", "d"])
+    assert fake.calls == [["b", "c"]]
+
+
+def test_provider_extras_are_not_forwarded(tmp_path):
+    fake = FakeEmbedder()
+    fake.embed_async = lambda texts: None
+    cache = CachedEmbedder(fake, path=str(tmp_path / "emb.sqlite3"))
+    # Anything but embed() would bypass the cache
+    assert not hasattr(cache, "embed_async")
+    assert cache.model_name == "fake"
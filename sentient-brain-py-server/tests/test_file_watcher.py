@@ -0,0 +1,61 @@
+"""File watcher tests: debounced events are coalesced into batches."""
+
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.services.file_watcher import CodeChangeHandler  # noqa: E402
+
+
+class FakeCodeGraphService:
+    def __init__(self):
+        self.batches = []
+
+    def process_files(self, files):
+        self.batches.append(sorted(path for path, _ in files))
+
+
+def write(path, text):
+    path.write_text(text)
+    return str(path)
+
+
+def test_events_are_debounced_into_one_batch(tmp_path):
+    a = write(tmp_path / "a.py", "x = 1\n")
+    b = write(tmp_path / "b.py", "y = 2\n")
+    service = FakeCodeGraphService()
+    handler = CodeChangeHandler(service, debounce_seconds=60)
+
+    for path in (a, b, a, a):
+        handler._process_file(path)
+    # Shutting down flushes pending paths without waiting out the debounce
+    handler.shutdown()
+
+    assert service.batches == [sorted([a, b])]
+
+
+def test_due_paths_are_returned_in_batches(tmp_path):
+    handler = CodeChangeHandler(FakeCodeGraphService(), debounce_seconds=60)
+    handler.shutdown()
+    handler._stopping = False
+    handler._pending = {"late.py": 2.0, "early.py": 1.0}
+
+    assert handler._next_due_batch() == ["early.py", "late.py"]
+    assert handler._in_flight == {"early.py", "late.py"}
+    handler._stopping = True
+    assert handler._next_due_batch() is None
+
+
+def test_unchanged_file_is_not_reprocessed(tmp_path):
+    a = write(tmp_path / "a.py", "x = 1\n")
+    service = FakeCodeGraphService()
+    handler = CodeChangeHandler(service, debounce_seconds=60)
+    handler.shutdown()
+
+    handler._process_batch_background([a])
+    handler._process_batch_background([a])
+    write(tmp_path / "a.py", "x = 10\n")
+    handler._process_batch_background([a])
+
+    assert service.batches == [[a], [a]]
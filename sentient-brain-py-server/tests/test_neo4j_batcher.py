@@ -0,0 +1,54 @@
+"""Neo4jBatcher tests: rows are split into `batch_size` chunks per statement."""
+
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.db.neo4j_driver import Neo4jBatcher  # noqa: E402
+
+
+class FakeResult:
+    def consume(self):
+        pass
+
+
+class FakeTx:
+    def __init__(self):
+        self.runs = []
+
+    def run(self, query, **params):
+        self.runs.append((query, params))
+        return FakeResult()
+
+
+def test_splits_columns_into_batches():
+    batcher = Neo4jBatcher(batch_size=2)
+    for i in range(5):
+        batcher.add_node(f"f{i}.py", "FILE", {"name": f"f{i}.py"})
+    batcher.add_node("f0.py:A", "CLASS", {"name": "A"})
+    for i in range(3):
+        batcher.add_rel("CONTAINS", f"f{i}.py", "f0.py:A")
+    assert (batcher.node_count, batcher.relationship_count) == (6, 3)
+
+    tx = FakeTx()
+    batcher.flush(tx)
+
+    file_runs = [params for _, params in tx.runs if params.get("node_type") == "FILE"]
+    assert [params["ids"] for params in file_runs] == [["f0.py", "f1.py"], ["f2.py", "f3.py"], ["f4.py"]]
+    assert all(len(params["props"]) == len(params["ids"]) for params in file_runs)
+
+    rel_runs = [params for _, params in tx.runs if params.get("rel_type") == "CONTAINS"]
+    assert [params["source_ids"] for params in rel_runs] == [["f0.py", "f1.py"], ["f2.py"]]
+    assert [params["props"] for params in rel_runs] == [[{}, {}], [{}]]
+
+    # Nodes are written before the relationships that match on them
+    assert tx.runs[-1][1].get("rel_type") == "CONTAINS"
+    assert len(tx.runs) == 3 + 1 + 2
+    assert (batcher.node_count, batcher.relationship_count) == (0, 0)
+
+
+def test_empty_flush_runs_nothing():
+    tx = FakeTx()
+    Neo4jBatcher().flush(tx)
+    assert tx.runs == []
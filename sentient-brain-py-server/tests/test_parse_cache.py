@@ -0,0 +1,53 @@
+"""ParseCache tests: hits, misses, failed parses and LRU eviction."""
+
+import itertools
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.models.graph_models import CodeNode, NodeType  # noqa: E402
+from src.parsers import cache as parse_cache  # noqa: E402
+from src.parsers.cache import ParseCache  # noqa: E402
+
+
+def result(path):
+    return [CodeNode(id=path, node_type=NodeType.FILE, name=path, start_line=1, end_line=1)], []
+
+
+def test_hit_and_miss(tmp_path):
+    cache = ParseCache(path=str(tmp_path / "parse.sqlite3"))
+    cache.put("a.py", "x = 1", result("a.py"))
+
+    nodes, rels = cache.get("a.py", "x = 1")
+    assert [node.id for node in nodes] == ["a.py"] and rels == []
+    # Different content or a different path is a miss
+    assert cache.get("a.py", "x = 2") is None
+    assert cache.get("b.py", "x = 1") is None
+
+
+def test_failed_parse_not_cached(tmp_path):
+    cache = ParseCache(path=str(tmp_path / "parse.sqlite3"))
+    cache.put("a.py", "def (", ([], []))
+    assert cache.get("a.py", "def (") is None
+
+
+def test_entries_survive_reopen(tmp_path):
+    path = str(tmp_path / "parse.sqlite3")
+    ParseCache(path=path).put("a.py", "x = 1", result("a.py"))
+    assert ParseCache(path=path).get("a.py", "x = 1") is not None
+
+
+def test_evicts_least_recently_used(tmp_path, monkeypatch):
+    clock = itertools.count(1)
+    monkeypatch.setattr(parse_cache.time, "time", lambda: float(next(clock)))
+    cache = ParseCache(path=str(tmp_path / "parse.sqlite3"), max_entries=3)
+    for name in ("a", "b", "c"):
+        cache.put(f"{name}.py", name, result(f"{name}.py"))
+    # Reading "a" makes "b" and "c" the oldest entries
+    assert cache.get("a.py", "a") is not None
+
+    cache.put("d.py", "d", result("d.py"))
+
+    kept = {name for name in "abcd" if cache.get(f"{name}.py", name) is not None}
+    assert kept == {"a", "d"}
@@ -0,0 +1,40 @@
+"""Python parser tests: definitions nested in compound statements are found."""
+
+import os
+import sys
+import textwrap
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.models.graph_models import NodeType  # noqa: E402
+from src.parsers.python_parser import PythonParser  # noqa: E402
+
+SOURCE = textwrap.dedent(
+    """\
+    try:
+        import json
+    except ImportError:
+        json = None
+
+    if json:
+        class Config:
+            with open(__file__) as f:
+                def load(self):
+                    return [lambda: 1 for _ in range(3)]
+    else:
+        def fallback():
+            pass
+    """
+)
+
+
+def test_descends_into_compound_statements():
+    nodes, _ = PythonParser().parse("pkg/mod.py", SOURCE)
+    by_id = {node.id: node for node in nodes}
+
+    assert by_id["import:json"].node_type == NodeType.IMPORT
+    assert by_id["pkg/mod.py:Config"].node_type == NodeType.CLASS
+    assert by_id["pkg/mod.py:Config:load"].node_type == NodeType.METHOD
+    assert by_id["pkg/mod.py:fallback"].node_type == NodeType.FUNCTION
+    # Expressions (the lambda, the comprehension) define no nodes
+    assert len(nodes) == 5
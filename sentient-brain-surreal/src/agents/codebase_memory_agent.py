@@ -7,8 +7,10 @@ information within SurrealDB. Provides real-time monitoring and updates.
 import asyncio
 import os
 import hashlib
+import mmap
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Set
+from typing import Dict, List, Any, Optional, Set, Tuple, Iterator
 from datetime import datetime
 import logging
 import ast
@@ -16,6 +18,16 @@ import re
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 
+try:
+    import pathspec
+except ImportError:  # .gitignore rules are skipped; hard excludes still apply
+    pathspec = None
+
+try:
+    from blake3 import blake3
+except ImportError:  # fall back to SHA-256 fingerprints
+    blake3 = None
+
 from ..models.memory_layers import RelationshipType
 from ..models.agent_models import AgentConfig, AgentMessage, AgentResponse
 from ..services.groq_service import GroqLLMService
@@ -23,6 +35,111 @@ from ..services.memory_service import MemoryService
 
 logger = logging.getLogger(__name__)
 
+# Files at or above this size are hashed directly over their mapped pages
+MMAP_HASH_THRESHOLD = 256 * 1024
+
+# Files at or above this size are hashed by blake3 across all cores
+PARALLEL_HASH_THRESHOLD = 1024 * 1024
+
+# Maximum number of changed files written to SurrealDB concurrently
+INDEX_CONCURRENCY = 16
+
+# SurrealQL used on the indexing hot paths; values are always bound as
+# parameters so the statement text stays constant between calls
+IMPORT_CHUNKS_QUERY = "SELECT id, content FROM code_chunks WHERE chunk_type = 'imports'"
+CODE_FILE_PATHS_QUERY = "SELECT id, file_path FROM code_files"
+CODE_FILE_BY_PATH_QUERY = "SELECT * FROM code_files WHERE file_path = $path LIMIT 1"
+DELETE_CODE_FILE_QUERY = "DELETE FROM code_files WHERE file_path = $path"
+DELETE_CODE_FILES_QUERY = "DELETE FROM code_files WHERE file_path IN $paths"
+FILE_TYPE_COUNTS_QUERY = "SELECT file_type, count() AS count FROM code_files GROUP BY file_type"
+CHUNK_TYPE_COUNTS_QUERY = "SELECT chunk_type, count() AS count FROM code_chunks GROUP BY chunk_type"
+
+
+def get_file_hash(file_path: Path) -> str:
+    """Return a 64-hex content fingerprint of a file's raw bytes.
+
+    Uses blake3 (SIMD, memory-mapped, multi-threaded above
+    ``PARALLEL_HASH_THRESHOLD``) when installed. Otherwise SHA-256: small
+    files go through ``hashlib.file_digest`` (the read/update loop runs in C);
+    large files are mmap'd so OpenSSL hashes the page cache in place.
+    """
+    if blake3 is not None:
+        size = os.stat(file_path).st_size
+        if size == 0:
+            return blake3().hexdigest()
+        max_threads = blake3.AUTO if size >= PARALLEL_HASH_THRESHOLD else 1
+        return blake3(max_threads=max_threads).update_mmap(str(file_path)).hexdigest()
+    
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size >= MMAP_HASH_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return hashlib.sha256(mm).hexdigest()
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def load_gitignore(root: Path) -> Optional["pathspec.PathSpec"]:
+    """Load ``root/.gitignore`` as a gitwildmatch spec, if present and supported."""
+    gitignore = root / ".gitignore"
+    if pathspec is None or not gitignore.is_file():
+        return None
+    try:
+        return pathspec.PathSpec.from_lines(
+            "gitwildmatch", gitignore.read_text(encoding="utf-8").splitlines()
+        )
+    except (OSError, UnicodeDecodeError) as e:
+        logger.warning(f"Ignoring unreadable {gitignore}: {e}")
+        return None
+
+
+def _walk_files(
+    root: str,
+    extensions: Set[str],
+    exclude_dirs: Set[str],
+    ignore_spec: Optional["pathspec.PathSpec"] = None
+) -> Iterator[Tuple[str, str, os.stat_result]]:
+    """Yield ``(path, relative_path, stat)`` for matching files under ``root``.
+
+    A single ``os.scandir`` walk: excluded and gitignored directories are
+    pruned instead of descended into, and each file is stat'ed exactly once.
+    Relative paths are built by string concatenation as the walk descends.
+    """
+    stack = [(root, "")]
+    while stack:
+        directory, rel_dir = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    rel_path = rel_dir + entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name in exclude_dirs:
+                            continue
+                        if ignore_spec and ignore_spec.match_file(rel_path + "/"):
+                            continue
+                        stack.append((entry.path, rel_path + os.sep))
+                    elif (entry.is_file(follow_symlinks=False) and
+                          os.path.splitext(entry.name)[1] in extensions):
+                        if ignore_spec and ignore_spec.match_file(rel_path):
+                            continue
+                        yield entry.path, rel_path, entry.stat(follow_symlinks=False)
+        except OSError as e:
+            logger.warning(f"Skipping unreadable directory: {e}")
+
+
+def _hash_if_changed(
+    file_path: Path, st: os.stat_result, known_stat: Optional[Tuple[int, int]]
+) -> Tuple[Path, os.stat_result, Optional[str]]:
+    """Hash a file on a worker thread unless its size and mtime match ``known_stat``.
+
+    Read errors yield an empty hash so the error resurfaces when the file
+    is indexed.
+    """
+    if known_stat == (st.st_size, st.st_mtime_ns):
+        return file_path, st, None
+    try:
+        return file_path, st, get_file_hash(file_path)
+    except OSError:
+        return file_path, st, ""
+
 
 class CodeFileType(str):
     """Supported code file types."""
@@ -76,10 +193,22 @@ class CodeFile:
 
 
 class CodebaseWatcher(FileSystemEventHandler):
-    """File system watcher for real-time codebase monitoring."""
+    """File system watcher for real-time codebase monitoring.
+    
+    watchdog delivers events on its observer thread, so they are handed to the
+    agent's event loop with ``call_soon_threadsafe`` and coalesced for
+    ``debounce_seconds``; each path is then handled once per batch with its
+    latest change type.
+    """
     
-    def __init__(self, agent: 'CodebaseMemoryAgent'):
+    def __init__(self, agent: 'CodebaseMemoryAgent', debounce_seconds: float = 0.2):
         self.agent = agent
+        self.debounce_seconds = debounce_seconds
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: Dict[str, str] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        # The loop only keeps weak references to tasks; hold them until done
+        self._tasks: Set[asyncio.Task] = set()
         self.supported_extensions = {
             '.py', '.js', '.ts', '.jsx', '.tsx', '.java', '.cpp', '.cc', '.h', '.hpp',
             '.go', '.rs', '.rb', '.php', '.cs', '.swift', '.kt', '.scala', '.sh'
@@ -87,19 +216,49 @@ class CodebaseWatcher(FileSystemEventHandler):
     
     def on_modified(self, event):
         if not event.is_directory and self._is_supported_file(event.src_path):
-            asyncio.create_task(self.agent.handle_file_change(event.src_path, "modified"))
+            self._schedule(event.src_path, "modified")
     
     def on_created(self, event):
         if not event.is_directory and self._is_supported_file(event.src_path):
-            asyncio.create_task(self.agent.handle_file_change(event.src_path, "created"))
+            self._schedule(event.src_path, "created")
     
     def on_deleted(self, event):
         if not event.is_directory and self._is_supported_file(event.src_path):
-            asyncio.create_task(self.agent.handle_file_change(event.src_path, "deleted"))
+            self._schedule(event.src_path, "deleted")
+    
+    def on_moved(self, event):
+        if event.is_directory:
+            return
+        if self._is_supported_file(event.src_path):
+            self._schedule(event.src_path, "deleted")
+        if self._is_supported_file(event.dest_path):
+            self._schedule(event.dest_path, "created")
     
     def _is_supported_file(self, file_path: str) -> bool:
         """Check if file type is supported for monitoring."""
         return Path(file_path).suffix.lower() in self.supported_extensions
+    
+    def _schedule(self, file_path: str, change_type: str):
+        """Hand an event from the observer thread to the agent's event loop."""
+        if self.loop is not None and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self._enqueue, file_path, change_type)
+    
+    def _enqueue(self, file_path: str, change_type: str):
+        self._pending[file_path] = change_type
+        if self._flush_handle is None:
+            self._flush_handle = self.loop.call_later(self.debounce_seconds, self._flush)
+    
+    def _flush(self):
+        batch, self._pending = self._pending, {}
+        self._flush_handle = None
+        task = self.loop.create_task(self.agent.handle_file_changes(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._task_done)
+    
+    def _task_done(self, task: asyncio.Task):
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Error handling file changes: {task.exception()}")
 
 
 class CodebaseMemoryAgent:
@@ -118,7 +277,8 @@ class CodebaseMemoryAgent:
         self.config = config
         self.llm = llm_service
         self.memory = memory_service
-        self.codebase_path = Path(codebase_path)
+        # Resolved once; walk and watcher paths are absolute under this root
+        self.codebase_path = Path(codebase_path).resolve()
         
         # File monitoring
         self.observer = Observer()
@@ -127,6 +287,7 @@ class CodebaseMemoryAgent:
         
         # Caching and state
         self.file_hashes: Dict[str, str] = {}
+        self.file_stats: Dict[str, Tuple[int, int]] = {}  # (size, mtime_ns)
         self.indexed_files: Set[str] = set()
         
         # Language parsers
@@ -173,6 +334,7 @@ class CodebaseMemoryAgent:
     async def start_monitoring(self):
         """Start real-time file system monitoring."""
         try:
+            self.watcher.loop = asyncio.get_running_loop()
             self.observer.schedule(self.watcher, str(self.codebase_path), recursive=True)
             self.observer.start()
             self.monitoring = True
@@ -200,6 +362,7 @@ class CodebaseMemoryAgent:
         try:
             stats = {
                 "files_processed": 0,
+                "files_unchanged": 0,
                 "chunks_created": 0,
                 "relationships_created": 0,
                 "errors": []
@@ -207,14 +370,59 @@ class CodebaseMemoryAgent:
             
             # Find all code files
             code_files = self._find_code_files()
+            relative_paths = {file_path: relative_path for file_path, relative_path, _ in code_files}
+            
+            # Hash on a thread pool (hashlib releases the GIL) and start
+            # indexing each file as its hash lands. Changed files are indexed
+            # concurrently so their DB round-trips overlap instead of queueing.
+            # Files whose size and mtime are unchanged are never re-read.
+            semaphore = asyncio.Semaphore(INDEX_CONCURRENCY)
+            
+            async def index_bounded(file_path: Path, content_hash: Optional[str], st: os.stat_result):
+                async with semaphore:
+                    try:
+                        await self._index_file(
+                            file_path, content_hash, st, relative_paths[file_path]
+                        )
+                        stats["files_processed"] += 1
+                    except Exception as e:
+                        stats["errors"].append(f"{file_path}: {str(e)}")
+                        logger.error(f"Failed to index file {file_path}: {e}")
+            
+            loop = asyncio.get_running_loop()
+            index_tasks = []
+            with ThreadPoolExecutor(max_workers=(os.cpu_count() or 1) * 2) as executor:
+                hash_futures = [
+                    loop.run_in_executor(
+                        executor,
+                        _hash_if_changed,
+                        file_path,
+                        st,
+                        self.file_stats.get(relative_paths[file_path]),
+                    )
+                    for file_path, _, st in code_files
+                ]
+                for next_hash in asyncio.as_completed(hash_futures):
+                    file_path, st, content_hash = await next_hash
+                    if content_hash is None:
+                        stats["files_unchanged"] += 1
+                        continue
+                    index_tasks.append(
+                        asyncio.create_task(index_bounded(file_path, content_hash or None, st))
+                    )
+            await asyncio.gather(*index_tasks)
             
-            for file_path in code_files:
-                try:
-                    await self._index_file(file_path)
-                    stats["files_processed"] += 1
-                except Exception as e:
-                    stats["errors"].append(f"{file_path}: {str(e)}")
-                    logger.error(f"Failed to index file {file_path}: {e}")
+            # Drop files that disappeared since the last run in one statement
+            vanished = self.indexed_files - set(relative_paths.values())
+            if vanished:
+                await self.memory.db.query_records(
+                    DELETE_CODE_FILES_QUERY, {"paths": sorted(vanished)}
+                )
+                for relative_path in vanished:
+                    self.file_hashes.pop(relative_path, None)
+                    self.file_stats.pop(relative_path, None)
+                self.indexed_files -= vanished
+                stats["files_removed"] = len(vanished)
             
             # Create cross-file relationships
             await self._create_cross_file_relationships()
@@ -226,39 +434,50 @@ class CodebaseMemoryAgent:
             logger.error(f"Failed to index codebase: {e}")
             return {"error": str(e)}
     
-    def _find_code_files(self) -> List[Path]:
-        """Find all code files in the codebase."""
-        code_files = []
-        
+    def _find_code_files(self) -> List[Tuple[Path, str, os.stat_result]]:
+        """Find all code files in the codebase with their relative paths and stats."""
         # File extensions to include
         extensions = {'.py', '.js', '.ts', '.jsx', '.tsx', '.java', '.cpp', '.h', '.go', '.rs'}
         
-        # Directories to exclude
-        exclude_dirs = {'.git', '__pycache__', 'node_modules', '.venv', 'venv', 'build', 'dist'}
-        
-        for file_path in self.codebase_path.rglob('*'):
-            if (file_path.is_file() and 
-                file_path.suffix in extensions and
-                not any(exclude_dir in file_path.parts for exclude_dir in exclude_dirs)):
-                code_files.append(file_path)
+        # Directories to exclude regardless of .gitignore
+        exclude_dirs = {
+            '.git', '__pycache__', 'node_modules', '.venv', 'venv', 'build', 'dist', '.mypy_cache'
+        }
         
-        return code_files
+        ignore_spec = load_gitignore(self.codebase_path)
+        return [
+            (Path(path), relative_path, st)
+            for path, relative_path, st in _walk_files(
+                str(self.codebase_path), extensions, exclude_dirs, ignore_spec
+            )
+        ]
     
-    async def _index_file(self, file_path: Path):
-        """Index a single code file."""
+    async def _index_file(
+        self,
+        file_path: Path,
+        content_hash: Optional[str] = None,
+        st: Optional[os.stat_result] = None,
+        relative_path: Optional[str] = None
+    ):
+        """Index a single code file, reusing a precomputed stat/hash/path when given."""
         try:
+            # Calculate content hash before decoding anything
+            if st is None:
+                st = file_path.stat()
+            if content_hash is None:
+                content_hash = get_file_hash(file_path)
+            
+            # Skip if file hasn't changed (a touch only refreshes the stat)
+            if relative_path is None:
+                relative_path = str(file_path.relative_to(self.codebase_path))
+            if relative_path in self.file_hashes and self.file_hashes[relative_path] == content_hash:
+                self.file_stats[relative_path] = (st.st_size, st.st_mtime_ns)
+                return
+            
             # Read file content
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
             
-            # Calculate content hash
-            content_hash = hashlib.sha256(content.encode()).hexdigest()
-            
-            # Skip if file hasn't changed
-            relative_path = str(file_path.relative_to(self.codebase_path))
-            if relative_path in self.file_hashes and self.file_hashes[relative_path] == content_hash:
-                return
-            
             # Determine file type
             file_type = self._determine_file_type(file_path)
             
@@ -271,7 +490,7 @@ class CodebaseMemoryAgent:
                 size=len(content),
                 lines=content.count('\n') + 1,
                 hash=content_hash,
-                last_modified=datetime.fromtimestamp(file_path.stat().st_mtime),
+                last_modified=datetime.fromtimestamp(st.st_mtime),
                 indexed_at=datetime.utcnow()
             )
             
@@ -282,11 +501,11 @@ class CodebaseMemoryAgent:
             chunks = await self._parse_and_chunk_file(code_file)
             
             # Store chunks
-            for chunk in chunks:
-                await self._store_code_chunk(chunk)
+            await self._store_code_chunks(chunks)
             
             # Update tracking
             self.file_hashes[relative_path] = content_hash
+            self.file_stats[relative_path] = (st.st_size, st.st_mtime_ns)
             self.indexed_files.add(relative_path)
             
             logger.debug(f"Indexed file: {relative_path} ({len(chunks)} chunks)")
@@ -579,36 +798,39 @@ class CodebaseMemoryAgent:
             logger.error(f"Failed to store code file {code_file.file_path}: {e}")
             raise
     
-    async def _store_code_chunk(self, chunk: CodeChunk):
-        """Store code chunk in memory system."""
+    async def _store_code_chunks(self, chunks: List[CodeChunk]):
+        """Store a file's code chunks and their HAS_CHUNK links with one insert each."""
+        if not chunks:
+            return
+        
         try:
-            # Generate embedding for chunk content
-            embedding = self.memory.generate_embedding(chunk.content)
-            
-            # Store in database
-            chunk_data = {
-                "id": chunk.id,
-                "file_id": chunk.file_id,
-                "content": chunk.content,
-                "chunk_type": chunk.chunk_type,
-                "start_line": chunk.start_line,
-                "end_line": chunk.end_line,
-                "embedding": embedding,
-                **chunk.metadata
-            }
-            
-            await self.memory.db.create_record("code_chunks", chunk_data)
-            
-            # Create relationship to parent file
-            await self.memory.create_relationship(
-                chunk.file_id,
-                chunk.id,
+            # Embed every chunk of the file in one batched call
+            embeddings = self.memory.generate_embeddings([chunk.content for chunk in chunks])
+            
+            chunk_rows = []
+            for chunk, embedding in zip(chunks, embeddings):
+                chunk_rows.append({
+                    "id": chunk.id,
+                    "file_id": chunk.file_id,
+                    "content": chunk.content,
+                    "chunk_type": chunk.chunk_type,
+                    "start_line": chunk.start_line,
+                    "end_line": chunk.end_line,
+                    "embedding": embedding,
+                    **chunk.metadata
+                })
+            
+            await self.memory.db.create_records("code_chunks", chunk_rows)
+            
+            # Create relationships to parent file
+            await self.memory.create_relationships(
+                [(chunk.file_id, chunk.id) for chunk in chunks],
                 RelationshipType.HAS_CHUNK,
                 created_by_agent=self.config.agent_id
             )
             
         except Exception as e:
-            logger.error(f"Failed to store code chunk {chunk.id}: {e}")
+            logger.error(f"Failed to store code chunks for {chunks[0].file_path}: {e}")
             raise
     
     # ================================
@@ -636,8 +858,13 @@ class CodebaseMemoryAgent:
         """Create relationships based on import statements."""
         try:
             # Get all import chunks
-            import_query = "SELECT * FROM code_chunks WHERE chunk_type = 'imports'"
-            import_chunks = await self.memory.db.query_records(import_query)
+            import_chunks = await self.memory.db.query_records(IMPORT_CHUNKS_QUERY)
+            if not import_chunks:
+                return
+            
+            # Prefetch every indexed file once instead of querying per import
+            files = await self.memory.db.query_records(CODE_FILE_PATHS_QUERY)
+            files_by_suffix = self._index_files_by_path_suffix(files)
             
             for chunk in import_chunks:
                 # Parse import statements to find dependencies
@@ -645,7 +872,7 @@ class CodebaseMemoryAgent:
                 
                 for imported_module in imports:
                     # Try to find corresponding file
-                    target_file = await self._find_file_by_module_name(imported_module)
+                    target_file = self._find_file_by_module_name(imported_module, files_by_suffix)
                     
                     if target_file:
                         await self.memory.create_relationship(
@@ -690,32 +917,46 @@ class CodebaseMemoryAgent:
         
         return imports
     
-    async def _find_file_by_module_name(self, module_name: str) -> Optional[Dict[str, Any]]:
-        """Find a code file by module name."""
-        try:
-            # Simple heuristic: convert module.name to module/name.py or module_name.py
-            possible_paths = [
-                f"{module_name.replace('.', '/')}.py",
-                f"{module_name.replace('.', '_')}.py",
-                f"{module_name}.py"
-            ]
-            
-            for path in possible_paths:
-                query = f"SELECT * FROM code_files WHERE file_path LIKE '%{path}' LIMIT 1"
-                results = await self.memory.db.query_records(query)
-                if results:
-                    return results[0]
-            
-            return None
-            
-        except Exception as e:
-            logger.error(f"Failed to find file for module {module_name}: {e}")
-            return None
+    def _index_files_by_path_suffix(
+        self, files: List[Dict[str, Any]]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Map every '/'-aligned suffix of each file path to its file record."""
+        files_by_suffix: Dict[str, Dict[str, Any]] = {}
+        for file_record in files:
+            parts = file_record["file_path"].replace("\\", "/").split("/")
+            for i in range(len(parts)):
+                files_by_suffix.setdefault("/".join(parts[i:]), file_record)
+        return files_by_suffix
+    
+    def _find_file_by_module_name(
+        self, module_name: str, files_by_suffix: Dict[str, Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        """Find a code file by module name in the prefetched suffix index."""
+        # Simple heuristic: convert module.name to module/name.py or module_name.py
+        possible_paths = [
+            f"{module_name.replace('.', '/')}.py",
+            f"{module_name.replace('.', '_')}.py",
+            f"{module_name}.py"
+        ]
+        
+        for path in possible_paths:
+            target_file = files_by_suffix.get(path)
+            if target_file:
+                return target_file
+        
+        return None
     
     # ================================
     # REAL-TIME MONITORING
     # ================================
     
+    async def handle_file_changes(self, changes: Dict[str, str]):
+        """Handle a coalesced batch of file changes (path -> latest change type)."""
+        await asyncio.gather(*(
+            self.handle_file_change(file_path, change_type)
+            for file_path, change_type in changes.items()
+        ))
+    
     async def handle_file_change(self, file_path: str, change_type: str):
         """Handle real-time file changes."""
         try:
@@ -739,12 +980,12 @@ class CodebaseMemoryAgent:
             # Remove from tracking
             if relative_path in self.file_hashes:
                 del self.file_hashes[relative_path]
+            self.file_stats.pop(relative_path, None)
             if relative_path in self.indexed_files:
                 self.indexed_files.remove(relative_path)
             
             # Remove from database
-            query = f"DELETE FROM code_files WHERE file_path = '{relative_path}'"
-            await self.memory.db.query_records(query)
+            await self.memory.db.query_records(DELETE_CODE_FILE_QUERY, {"path": relative_path})
             
         except Exception as e:
             logger.error(f"Failed to handle file deletion {file_path}: {e}")
@@ -798,8 +1039,9 @@ class CodebaseMemoryAgent:
         """Analyze dependencies for a specific file."""
         try:
             # Get file record
-            query = f"SELECT * FROM code_files WHERE file_path = '{file_path}' LIMIT 1"
-            file_results = await self.memory.db.query_records(query)
+            file_results = await self.memory.db.query_records(
+                CODE_FILE_BY_PATH_QUERY, {"path": file_path}
+            )
             
             if not file_results:
                 return {"error": "File not found"}
@@ -828,21 +1070,11 @@ class CodebaseMemoryAgent:
             stats = {}
             
             # File counts by type
-            file_type_query = """
-                SELECT file_type, count() as count 
-                FROM code_files 
-                GROUP BY file_type
-            """
-            file_type_results = await self.memory.db.query_records(file_type_query)
+            file_type_results = await self.memory.db.query_records(FILE_TYPE_COUNTS_QUERY)
             stats["files_by_type"] = {r["file_type"]: r["count"] for r in file_type_results}
             
             # Chunk counts by type
-            chunk_type_query = """
-                SELECT chunk_type, count() as count 
-                FROM code_chunks 
-                GROUP BY chunk_type
-            """
-            chunk_type_results = await self.memory.db.query_records(chunk_type_query)
+            chunk_type_results = await self.memory.db.query_records(CHUNK_TYPE_COUNTS_QUERY)
             stats["chunks_by_type"] = {r["chunk_type"]: r["count"] for r in chunk_type_results}
             
             # Total counts
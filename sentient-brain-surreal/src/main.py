@@ -5,8 +5,9 @@ This application serves as the central API gateway for the multi-agent system,
 integrating SurrealDB as the unified data layer and coordinating between
 specialized agents for intelligent code development assistance.
 """
-from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
 import logging
 from typing import Dict, Any, Optional, List
@@ -110,6 +111,8 @@ app = FastAPI(
     ensuring scalable, maintainable, and intelligent code development workflows.
     """,
     version="1.0.0",
+    # orjson serializes the record lists and datetimes returned here in C
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -203,12 +206,13 @@ async def create_project(
             frameworks=frameworks or []
         )
         
-        project_id = await db.create_record("projects", project_context.dict())
+        project_data = project_context.model_dump()
+        project_id = await db.create_record("projects", project_data)
         
         return {
             "project_id": project_id,
             "status": "created",
-            "project": project_context.dict()
+            "project": project_data
         }
         
     except Exception as e:
@@ -240,29 +244,56 @@ async def get_project(
 async def list_workflows(
     status: Optional[str] = None,
     workflow_type: Optional[str] = None,
-    limit: int = 50,
+    limit: int = Query(50, ge=1, le=500),
+    before: Optional[str] = None,
+    before_id: Optional[str] = None,
     db: SurrealDBService = Depends(get_db)
 ):
-    """List workflows with optional filtering."""
+    """
+    List workflows with optional filtering, newest first.
+    
+    Pages are keyset-paginated on ``(created_at, id)``, since ``created_at``
+    alone is not unique: pass the previous page's ``next_cursor`` values as
+    ``before`` and ``before_id`` to fetch the next page.
+    """
     try:
         query = "SELECT * FROM workflows"
         conditions = []
+        params: Dict[str, Any] = {"limit": limit}
         
         if status:
-            conditions.append(f"status = '{status}'")
+            conditions.append("status = $status")
+            params["status"] = status
         if workflow_type:
-            conditions.append(f"workflow_type = '{workflow_type}'")
+            conditions.append("workflow_type = $workflow_type")
+            params["workflow_type"] = workflow_type
+        if before and before_id:
+            conditions.append(
+                "(created_at < <datetime>$before"
+                " OR (created_at = <datetime>$before AND id < type::thing($before_id)))"
+            )
+            params["before"] = before
+            params["before_id"] = before_id
+        elif before:
+            conditions.append("created_at < <datetime>$before")
+            params["before"] = before
         
         if conditions:
             query += " WHERE " + " AND ".join(conditions)
         
-        query += f" ORDER BY created_at DESC LIMIT {limit}"
+        query += " ORDER BY created_at DESC, id DESC LIMIT $limit"
+        
+        workflows = await db.query_records(query, params)
         
-        workflows = await db.query_records(query)
+        next_cursor = None
+        if len(workflows) == limit:
+            last = workflows[-1]
+            next_cursor = {"before": last.get("created_at"), "before_id": str(last.get("id"))}
         
         return {
             "workflows": workflows,
-            "count": len(workflows)
+            "count": len(workflows),
+            "next_cursor": next_cursor
         }
         
     except Exception as e:
@@ -307,12 +338,13 @@ async def create_knowledge_node(
             metadata=metadata or {}
         )
         
-        node_id = await db.create_record("knowledge", knowledge_node.dict())
+        node_data = knowledge_node.model_dump()
+        node_id = await db.create_record("knowledge", node_data)
         
         return {
             "node_id": node_id,
             "status": "created",
-            "node": knowledge_node.dict()
+            "node": node_data
         }
         
     except Exception as e:
@@ -406,8 +438,10 @@ async def initialize_system(
 
 if __name__ == "__main__":
     import uvicorn
+    # Import string must match the package layout (relative imports) so the
+    # reloader imports this module exactly once, same as the Dockerfile CMD
     uvicorn.run(
-        "main:app",
+        "src.main:app",
         host="0.0.0.0",
         port=8000,
         reload=True,
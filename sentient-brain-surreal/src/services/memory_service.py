@@ -14,6 +14,7 @@ import logging
 from datetime import datetime
 import hashlib
 import json
+from collections import OrderedDict
 from sentence_transformers import SentenceTransformer
 
 from ..models.memory_layers import (
@@ -53,6 +54,10 @@ class MemoryService:
         self.embedder = SentenceTransformer(embedding_model)
         self.embedding_dimension = 384  # for all-MiniLM-L6-v2
         
+        # Embeddings keyed by content hash; identical text is encoded once
+        self._embedding_cache: "OrderedDict[str, List[float]]" = OrderedDict()
+        self.embedding_cache_size = 10000
+        
         # Layer table mappings
         self.layer_tables = {
             "plans": ["grand_plans", "tasks", "milestones", "completion_criteria"],
@@ -289,6 +294,20 @@ class MemoryService:
                 DEFINE INDEX idx_features_embedding ON features COLUMNS embedding MTREE DIMENSION 384;
                 """,
                 
+                # ================================
+                # CODEBASE LAYER INDEXES
+                # ================================
+                # Rows are written by CodebaseMemoryAgent with free-form
+                # metadata, so the tables stay schemaless; the indexes cover
+                # its lookups by path, chunk type and parent file.
+                """
+                DEFINE TABLE code_files SCHEMALESS;
+                DEFINE INDEX idx_code_files_path ON code_files COLUMNS file_path;
+                DEFINE TABLE code_chunks SCHEMALESS;
+                DEFINE INDEX idx_code_chunks_type ON code_chunks COLUMNS chunk_type;
+                DEFINE INDEX idx_code_chunks_file ON code_chunks COLUMNS file_id;
+                """,
+                
                 # ================================
                 # CROSS-LAYER RELATIONSHIPS SCHEMA
                 # ================================
@@ -327,12 +346,42 @@ class MemoryService:
     
     def generate_embedding(self, text: str) -> List[float]:
         """Generate vector embedding for text."""
-        try:
-            embedding = self.embedder.encode(text, convert_to_tensor=False)
-            return embedding.tolist()
-        except Exception as e:
-            logger.error(f"Failed to generate embedding: {e}")
-            return [0.0] * self.embedding_dimension
+        return self.generate_embeddings([text])[0]
+    
+    def generate_embeddings(self, texts: List[str], batch_size: int = 32) -> List[List[float]]:
+        """Generate vector embeddings for many texts in batched forward passes.
+        
+        Texts already embedded (by content hash) are served from cache and
+        duplicates within the batch are encoded once.
+        """
+        if not texts:
+            return []
+        
+        keys = [self.generate_content_hash(text) for text in texts]
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key in self._embedding_cache:
+                self._embedding_cache.move_to_end(key)
+            else:
+                missing.setdefault(key, text)
+        
+        if missing:
+            try:
+                embeddings = self.embedder.encode(
+                    list(missing.values()), batch_size=batch_size, convert_to_tensor=False
+                )
+            except Exception as e:
+                logger.error(f"Failed to generate embeddings: {e}")
+                fallback = {key: [0.0] * self.embedding_dimension for key in missing}
+                return [self._embedding_cache.get(key) or fallback[key] for key in keys]
+            
+            for key, embedding in zip(missing, embeddings.tolist()):
+                self._embedding_cache[key] = embedding
+        
+        results = [self._embedding_cache[key] for key in keys]
+        while len(self._embedding_cache) > self.embedding_cache_size:
+            self._embedding_cache.popitem(last=False)
+        return results
     
     def generate_content_hash(self, content: str) -> str:
         """Generate hash for content deduplication."""
@@ -656,7 +705,33 @@ class MemoryService:
         except Exception as e:
             logger.error(f"Failed to create relationship: {e}")
             return None
-    
+
+    async def create_relationships(
+        self,
+        pairs: List[Tuple[str, str]],
+        relationship_type: RelationshipType,
+        created_by_agent: str = "system"
+    ) -> List[str]:
+        """Create one relationship per (source_id, target_id) pair in a single insert."""
+        try:
+            relationships = [
+                MemoryRelationship(
+                    source_id=source_id,
+                    target_id=target_id,
+                    relationship_type=relationship_type,
+                    created_by_agent=created_by_agent
+                ).dict()
+                for source_id, target_id in pairs
+            ]
+
+            rel_ids = await self.db.create_records("memory_relationships", relationships)
+            logger.debug(f"Created {len(rel_ids)} {relationship_type} relationships")
+            return rel_ids
+
+        except Exception as e:
+            logger.error(f"Failed to create relationships: {e}")
+            return []
+
     async def get_relationships(
         self,
         entity_id: str,
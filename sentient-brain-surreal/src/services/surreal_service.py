@@ -112,6 +112,7 @@ class SurrealDBService:
                 DEFINE FIELD created_at ON workflows TYPE datetime DEFAULT time::now();
                 DEFINE INDEX idx_status ON workflows COLUMNS status;
                 DEFINE INDEX idx_workflow_type ON workflows COLUMNS workflow_type;
+                DEFINE INDEX idx_workflow_created_at ON workflows COLUMNS created_at;
                 """,
                 
                 # Projects table
@@ -170,7 +171,32 @@ class SurrealDBService:
         except Exception as e:
             logger.error(f"Failed to create record in {table}: {e}")
             return None
-    
+
+    async def create_records(self, table: str, records: List[Dict[str, Any]]) -> List[str]:
+        """
+        Create many records in the specified table with a single INSERT statement.
+
+        Args:
+            table: Table name
+            records: Record data for each row
+
+        Returns:
+            Created record IDs (empty if failed)
+        """
+        if not records:
+            return []
+
+        try:
+            result = await self.db.query(f"INSERT INTO {table} $records", {"records": records})
+            rows = result[0].get("result", []) if result else []
+            record_ids = [row.get("id", "") for row in rows]
+            logger.debug(f"Created {len(record_ids)} records in {table}")
+            return record_ids
+
+        except Exception as e:
+            logger.error(f"Failed to create records in {table}: {e}")
+            return []
+
     async def get_record(self, table: str, record_id: str) -> Optional[Dict[str, Any]]:
         """
         Retrieve a record by ID.
@@ -47,21 +47,26 @@ convert_to_container_path() {
     fi
 }
 
+# Send every changed file in one call so the commit is ingested as one batch
+FILE_ARGS=()
 for file in $FILES_CHANGED; do
     if [[ -f "$file" ]]; then
         container_path=$(convert_to_container_path "$file")
-        echo "[GIT-INDEX] Processing $file -> $container_path"
-        
-        # Use MSYS_NO_PATHCONV to prevent Git Bash path conversion on Windows
-        # Capture both stdout and stderr for better error reporting
-        if MSYS_NO_PATHCONV=1 docker exec "$CONTAINER" $PROCESS_CLI --file "$container_path" --commit-hash "$COMMIT_HASH" --commit-author "$COMMIT_AUTHOR" 2>&1; then
-            echo "[GIT-INDEX] ✓ Successfully processed $file"
-        else
-            echo "[GIT-INDEX] ✗ Failed to process $file (exit code: $?)"
-        fi
+        echo "[GIT-INDEX] Queuing $file -> $container_path"
+        FILE_ARGS+=(--file "$container_path")
     else
         echo "[GIT-INDEX] ⚠ File not found on host: $file (may have been deleted)"
     fi
 done
 
+if [ ${#FILE_ARGS[@]} -gt 0 ]; then
+    # Use MSYS_NO_PATHCONV to prevent Git Bash path conversion on Windows
+    # Capture both stdout and stderr for better error reporting
+    if MSYS_NO_PATHCONV=1 docker exec "$CONTAINER" $PROCESS_CLI "${FILE_ARGS[@]}" --commit-hash "$COMMIT_HASH" --commit-author "$COMMIT_AUTHOR" 2>&1; then
+        echo "[GIT-INDEX] ✓ Successfully processed $(( ${#FILE_ARGS[@]} / 2 )) file(s)"
+    else
+        echo "[GIT-INDEX] ✗ Failed to process changed files (exit code: $?)"
+    fi
+fi
+
 echo "[GIT-INDEX] Done processing commit $COMMIT_HASH."